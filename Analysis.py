@@ -0,0 +1,92 @@
+from Skills import scan
+from Contacts import extract_contacts
+from Extraction import MAX_PAGES, MAX_TEXT_CHARS, read_pdf
+from Scoring import score, until_sections
+from Classifier import classify, rank_fields
+from Courses import ds_course, web_course, android_course, ios_course, uiux_course, missing_skills, recommend
+
+# --- Field Recommendations ---
+# Field keywords live in Skills.TAXONOMY
+
+FIELDS = {
+    'Data Science': {
+        'recommended_skills': ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
+                               'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis',
+                               'Web Scraping', 'ML Algorithms', 'Keras', 'Pytorch', 'Probability', 'Scikit-learn',
+                               'Tensorflow', 'Flask', 'Streamlit'],
+        'courses': ds_course,
+    },
+    'Web Development': {
+        'recommended_skills': ['React', 'Django', 'Node JS', 'React JS', 'php', 'laravel', 'Magento', 'wordpress',
+                               'Javascript', 'Angular JS', 'c#', 'Flask', 'SDK'],
+        'courses': web_course,
+    },
+    'Android Development': {
+        'recommended_skills': ['Android', 'Android development', 'Flutter', 'Kotlin', 'XML', 'Java', 'Kivy', 'GIT',
+                               'SDK', 'SQLite'],
+        'courses': android_course,
+    },
+    'IOS Development': {
+        'recommended_skills': ['IOS', 'IOS Development', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode', 'Objective-C',
+                               'SQLite', 'Plist', 'StoreKit', 'UI-Kit', 'AV Foundation', 'Auto-Layout'],
+        'courses': ios_course,
+    },
+    'UI-UX Development': {
+        'recommended_skills': ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq', 'Prototyping',
+                               'Wireframes', 'Storyframes', 'Adobe Photoshop', 'Editing', 'Illustrator',
+                               'After Effects', 'Premier Pro', 'Indesign', 'Wireframe', 'Solid', 'Grasp',
+                               'User Research'],
+        'courses': uiux_course,
+    },
+}
+
+# --- Analysis Functions ---
+
+def candidate_level(page_count):
+    """Maps the resume page count to the candidate experience level."""
+    if page_count >= 3:
+        return "Experienced"
+    if page_count == 2:
+        return "Intermediate"
+    return "Fresher"
+
+def score_pdf(fh):
+    """Scores a PDF stream, parsing only as many pages as it takes to find every scored section."""
+    # Layout analysis stays on: headers are only found at line starts, which fast mode doesn't produce
+    resume_text, _ = read_pdf(fh, MAX_PAGES, MAX_TEXT_CHARS, stop=until_sections())
+    return score(resume_text)
+
+def recommend_courses(field, skills, count=4):
+    """Returns [(name, url)] of the courses covering most of the field's recommended skills the candidate lacks."""
+    if field not in FIELDS:
+        return []
+    return recommend(missing_skills(FIELDS[field]['recommended_skills'], skills), field, count)
+
+def analyze_many(resume_texts, page_counts):
+    """Analyses a batch of extracted resume texts, classifying all of them in one matrix operation."""
+    probabilities, matched = classify(resume_texts)
+    results = []
+    for resume_text, page_count, row, hit in zip(resume_texts, page_counts, probabilities, matched):
+        skills, _ = scan(resume_text)
+        field_scores = rank_fields(row)
+        field = field_scores[0][0] if hit else ''
+        contacts = extract_contacts(resume_text, page_count)
+        scored = score(resume_text)
+        results.append({
+            'name': contacts['name'],
+            'email': contacts['email'],
+            'phone': contacts['phone'],
+            'skills': skills,
+            'predicted_field': field,
+            'field_scores': field_scores,
+            'user_level': candidate_level(page_count),
+            'resume_score': scored['resume_score'],
+            'score_breakdown': scored['breakdown'],
+            'recommended_skills': FIELDS[field]['recommended_skills'] if field else [],
+            'recommended_courses': [name for name, _ in recommend_courses(field, skills)],
+        })
+    return results
+
+def analyze_resume(resume_text, page_count):
+    """Runs skill extraction, field classification and scoring on extracted resume text."""
+    return analyze_many([resume_text], [page_count])[0]
@@ -1,111 +1,83 @@
 import streamlit as st
 import pandas as pd
-import spacy
-import base64
-import sqlite3
+import os
 import re
-import io
-import nltk
-import yt_dlp
+import tempfile
+import time
 from PIL import Image
-from pdfminer.converter import TextConverter
-from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
-from pdfminer.layout import LAParams
-from pdfminer.pdfpage import PDFPage
 from streamlit_tags import st_tags
-from Courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
+from Extraction import MAX_PAGES, MAX_PDF_BYTES, extract_resume, get_cached_extraction, store_fields
+from Blobs import store as blob_store
+from Dedup import find_near_duplicate, index_resume, signature
+from Database import (PAGE_COLUMNS, connection, count_by, count_candidates_with_skill, count_resumes, daily_counts,
+                      fetch_page, init_db, insert_data, score_histogram, skill_frequency, skill_gap)
+from Search import search
+from Export import EXPORT_COLUMNS, EXPORTERS
+from Archive import archived_months, read_archive
+from Matching import match_resumes
+from Metrics import PROFILE_SLOWEST, observe, profile_request, render_prometheus, serve, slowest_profiles, summary
+from Preview import page_image
+from Pipeline import basic_info, skills_stage, score_stage, videos_stage, submit, completed, stream, with_contacts
+from Courses import resume_videos, interview_videos
 import plotly.express as px
 
-# --- Pre-run Setup: NLTK Downloader and SpaCy Model Loading ---
+# Bump when skills_stage or contact output changes so cached extractions are re-parsed
+FIELDS_VERSION = 6
+ADMIN_PAGE_SIZE = 50
+# Days shown in the uploads-over-time chart
+TREND_DAYS = 90
 
-# Function to download NLTK data if not present
-def download_nltk_data():
-    """Downloads required NLTK data packages."""
-    packages = ['stopwords', 'punkt']
-    for package in packages:
-        try:
-            nltk.data.find(f'corpora/{package}' if package == 'stopwords' else f'tokenizers/{package}')
-        except nltk.downloader.DownloadError:
-            nltk.download(package)
+# --- Helper Functions ---
 
-# Download data and load the SpaCy model at the start
-download_nltk_data()
-nlp = spacy.load('en_core_web_sm')
+def show_preview(pdf_bytes, content_hash, page_count, file_name):
+    """Shows a cached thumbnail of one resume page at a time; the PDF itself is only sent on download."""
+    pages = max(1, min(page_count or 1, MAX_PAGES))
+    page = st.number_input("Page", 1, pages, 1, key=f'preview-{content_hash}') if pages > 1 else 1
+    try:
+        st.image(page_image(pdf_bytes, content_hash, page - 1), caption=f"Page {page} of {page_count}")
+    except Exception as e:
+        st.warning(f"Couldn't render a preview: {e}")
+    st.download_button("Download full PDF", pdf_bytes, file_name=file_name, mime='application/pdf')
 
-# --- Helper Functions ---
+def show_archive(conn):
+    """Loads archived user_data rows for the chosen months and columns only."""
+    months = archived_months(conn)
+    if not months:
+        st.info("No rows have been archived yet. Run `python Archive.py --days 365` to move old rows out of the database.")
+        return
+    st.caption(f"{sum(rows for _, rows in months)} rows archived across {len(months)} months.")
+    selected = st.multiselect("Months", [month for month, _ in months], default=[months[-1][0]])
+    columns = st.multiselect("Columns", EXPORT_COLUMNS, default=['timestamp', 'name', 'predicted_field', 'resume_score'])
+    if selected and columns and st.button("Load archived rows"):
+        archived = read_archive(conn, selected, columns).to_pandas()
+        st.write(f"**{len(archived)}** rows")
+        st.dataframe(archived)
+        if 'predicted_field' in columns:
+            fields = archived['predicted_field'].value_counts().rename_axis('Field').reset_index(name='Count')
+            st.plotly_chart(px.pie(fields, values='Count', names='Field', title="Archived Candidate Fields"))
 
-def pdf_reader(file):
-    """Extracts text from a PDF file."""
-    resource_manager = PDFResourceManager()
-    fake_file_handle = io.StringIO()
-    converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-    page_interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file, 'rb') as fh:
-        for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
-            page_interpreter.process_page(page)
-        text = fake_file_handle.getvalue()
-    converter.close()
-    fake_file_handle.close()
-    return text
-
-def show_pdf(file_path):
-    """Displays a PDF file in the app."""
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
-
-def get_youtube_video_info(video_url):
-    """Fetches YouTube video title and thumbnail using yt-dlp."""
-    ydl_opts = {'quiet': True, 'skip_download': True}
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        try:
-            info = ydl.extract_info(video_url, download=False)
-            title = info.get('title', 'N/A')
-            thumbnail = info.get('thumbnail', None)
-            return title, thumbnail
-        except yt_dlp.utils.DownloadError:
-            return "Video not available", None
-
-# --- Database Functions ---
-
-def create_connection():
-    """Creates a connection to the SQLite database."""
-    return sqlite3.connect('resume_data.db')
-
-def create_table():
-    """Creates the user_data table if it doesn't exist."""
-    conn = create_connection()
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS user_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            email TEXT,
-            resume_score REAL,
-            timestamp DATETIME,
-            page_no INTEGER,
-            predicted_field TEXT,
-            user_level TEXT,
-            actual_skills TEXT,
-            recommended_skills TEXT,
-            recommended_courses TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def insert_data(name, email, resume_score, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses):
-    """Inserts analysis data into the database."""
-    conn = create_connection()
-    c = conn.cursor()
-    timestamp = pd.to_datetime('now')
-    c.execute(
-        "INSERT INTO user_data (name, email, resume_score, timestamp, page_no, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (name, email, resume_score, timestamp, 1, predicted_field, user_level, str(actual_skills), str(recommended_skills), str(recommended_courses))
-    )
-    conn.commit()
-    conn.close()
+def show_performance():
+    """Shows span latencies recorded in this process, the Prometheus text and kept slow-request profiles."""
+    rows = summary()
+    if not rows:
+        st.info("No spans recorded in this process yet.")
+        return
+    spans = pd.DataFrame([(name, calls, mean * 1000, p50 * 1000, p95 * 1000, p99 * 1000, total)
+                          for name, calls, mean, p50, p95, p99, total in rows],
+                         columns=['Span', 'Calls', 'Mean (ms)', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Total (s)'])
+    st.dataframe(spans)
+    st.plotly_chart(px.bar(spans.head(15), x='Span', y='p95 (ms)', title='Slowest Spans (p95)'))
+    with st.expander("Prometheus metrics"):
+        st.code(render_prometheus(), language='text')
+    profiles = slowest_profiles()
+    if profiles:
+        st.subheader("Slowest Analyses (cProfile)")
+        for seconds, path in profiles:
+            with open(path, 'rb') as f:
+                st.download_button(f"{os.path.basename(path)} ({seconds * 1000:.0f} ms)", f,
+                                   file_name=os.path.basename(path), key=path)
+    elif not PROFILE_SLOWEST:
+        st.caption("Set SRA_PROFILE_SLOWEST=N to keep cProfile dumps of the N slowest analyses.")
 
 # --- Main Application Logic ---
 
@@ -113,75 +85,228 @@ def main():
     """Main function to run the Streamlit app."""
     st.set_page_config(page_title="Resume Analyzer", layout="wide")
     
-    # Create database table on first run
-    create_table()
+    # Schema migrations run once per process, not on every rerun
+    init_db()
+    # /metrics for Prometheus when SRA_METRICS_PORT is set; started once per process
+    serve()
 
     st.title("AI-Powered Resume Analyzer 💡")
     st.sidebar.markdown("# Choose a Page")
     page = st.sidebar.radio("Navigation", ["Resume Analysis", "Admin"])
 
     if page == "Resume Analysis":
-        # Placeholder for resume analysis logic (pyresparser, etc.)
-        # This part requires the pyresparser library to be fully implemented.
-        # For now, we'll focus on the structure.
         st.header("Upload Your Resume")
         uploaded_file = st.file_uploader("Upload your resume in PDF format", type=['pdf'])
 
-        if uploaded_file:
-            st.success("File uploaded successfully!")
-            # This is where you would call pyresparser to get skills, name, etc.
-            # Example placeholder data:
-            resume_data = {
-                'name': 'John Doe',
-                'email': 'john.doe@email.com',
-                'skills': ['Python', 'Data Analysis', 'Machine Learning', 'SQL']
-            }
-            st.write(f"**Name:** {resume_data['name']}")
-            st.write(f"**Email:** {resume_data['email']}")
-            st.write(f"**Skills:** {', '.join(resume_data['skills'])}")
-
-            # Placeholder for analysis and recommendations
-            st.header("Analysis & Recommendations")
-            st.write("Based on your resume, we recommend the following...")
-            
-            # --- Recommendations Section ---
-            st.subheader("Recommended Courses")
-            for course_name, course_link in ds_course.items():
-                st.markdown(f"[{course_name}]({course_link})")
-            
-            st.subheader("Resume Improvement Videos")
-            for video_url in resume_videos:
-                title, thumbnail = get_youtube_video_info(video_url)
-                if thumbnail:
-                    st.image(thumbnail, width=300)
-                    st.markdown(f"[{title}]({video_url})")
+        if uploaded_file and uploaded_file.size > MAX_PDF_BYTES:
+            st.error(f"Please upload a PDF smaller than {MAX_PDF_BYTES // (1024 * 1024)} MB.")
+        elif uploaded_file:
+            # The whole analysis is one traced request; with SRA_PROFILE_SLOWEST set the slowest are profiled
+            with profile_request('request.analysis'):
+                st.success("File uploaded successfully!")
+                start = time.perf_counter()
+                # Videos don't depend on the resume, so fetch them while the PDF is parsed
+                futures = {'videos': submit('videos', videos_stage, resume_videos)}
+
+                # Repeat uploads of the same file are served from the extraction cache
+                # Near-duplicates of an analysed resume (e.g. a lightly edited resubmission) reuse its parsed fields
+                with connection() as conn:
+                    extraction = extract_resume(conn, uploaded_file.getvalue())
+                    resume_text = extraction['text']
+                    resume_signature = signature(resume_text)
+                    duplicate = find_near_duplicate(conn, resume_signature, extraction['hash'])
+                    with conn:
+                        index_resume(conn, extraction['hash'], resume_signature, duplicate)
+                    duplicate_fields = None
+                    if duplicate and extraction['fields_version'] != FIELDS_VERSION:
+                        cached = get_cached_extraction(conn, duplicate[0])
+                        if cached and cached['fields_version'] == FIELDS_VERSION:
+                            duplicate_fields = cached['fields']
+
+                # --- Basic Info (first result) ---
+                # Cached fields of this exact file carry its contacts; a near-duplicate's may differ
+                cached_fields = extraction['fields'] if extraction['fields_version'] == FIELDS_VERSION else None
+                basic = basic_info(resume_text, extraction['page_count'], cached_fields)
+                st.write(f"**Name:** {basic['name']}")
+                st.write(f"**Email:** {basic['email']}")
+                if basic['phone']:
+                    st.write(f"**Phone:** {basic['phone']}")
+                st.write(f"**Pages:** {basic['page_count']} ({basic['user_level']})")
+                first_result = time.perf_counter() - start
+                observe('first_result', first_result)
+                st.caption(f"Analysed in {first_result * 1000:.0f} ms")
+                if duplicate:
+                    st.info(f"This resume is {duplicate[2]:.0%} similar to one analysed before.")
+                with st.expander("Resume Preview", expanded=True):
+                    show_preview(uploaded_file.getvalue(), extraction['hash'], extraction['page_count'], uploaded_file.name)
+
+                # Slots keep the page layout stable while stages finish in any order
+                skills_slot, score_slot = st.container(), st.container()
+                st.header("Analysis & Recommendations")
+                courses_slot, videos_slot = st.container(), st.container()
+                if cached_fields is not None:
+                    futures['skills'] = completed(cached_fields)
+                elif duplicate_fields is not None:
+                    futures['skills'] = completed(duplicate_fields)
                 else:
-                    st.warning(f"Could not load video: {title}")
-    
+                    futures['skills'] = submit('skills', skills_stage, resume_text)
+                futures['score'] = submit('score', score_stage, resume_text)
+
+                results = {}
+                for stage, result in stream(futures):
+                    results[stage] = result
+                    if stage == 'skills':
+                        if cached_fields is None:
+                            with connection() as conn:
+                                store_fields(conn, extraction['hash'], with_contacts(result, basic), FIELDS_VERSION)
+                        with skills_slot:
+                            st.write(f"**Skills:** {', '.join(result['skills'])}")
+                            if result['predicted_field']:
+                                st.success(f"Our analysis says you are looking for {result['predicted_field']} jobs.")
+                                field_scores = pd.DataFrame(result['field_scores'], columns=['Field', 'Probability'])
+                                st.bar_chart(field_scores, x='Field', y='Probability')
+                        with courses_slot:
+                            st.subheader("Recommended Courses")
+                            for course_name, course_link in result['courses']:
+                                st.markdown(f"[{course_name}]({course_link})")
+                    elif stage == 'score':
+                        with score_slot:
+                            st.subheader("Resume Tips & Ideas")
+                            for item in result['breakdown']:
+                                st.markdown(f"{'[+]' if item['earned'] else '[-]'} {item['tip']}")
+                            st.subheader("Resume Score")
+                            st.progress(result['resume_score'] / 100)
+                            st.write(f"Your resume writing score: {result['resume_score']}")
+                    elif stage == 'videos':
+                        with videos_slot:
+                            st.subheader("Resume Improvement Videos")
+                            for video_url, title, thumbnail in result:
+                                if thumbnail:
+                                    st.image(thumbnail, width=300)
+                                    st.markdown(f"[{title}]({video_url})")
+                                else:
+                                    st.warning(f"Could not load video: {title}")
+
+                # Record each upload once per session, not on every rerun
+                if st.session_state.get('recorded_hash') != extraction['hash']:
+                    uploaded_file.seek(0)
+                    blob_id, _ = blob_store.put_stream(uploaded_file)
+                    skills = results['skills']
+                    insert_data(basic['name'], basic['email'], results['score']['resume_score'], skills['predicted_field'],
+                                basic['user_level'], skills['skills'], skills['recommended_skills'],
+                                [course_name for course_name, _ in skills['courses']], basic['page_count'], extraction['hash'],
+                                resume_text, blob_id)
+                    st.session_state['recorded_hash'] = extraction['hash']
+
     elif page == "Admin":
         st.header("Admin Panel")
-        conn = create_connection()
-        try:
-            df = pd.read_sql_query("SELECT * FROM user_data", conn)
-            st.dataframe(df)
-            
-            # --- Admin Dashboard Visuals ---
-            if not df.empty:
-                st.subheader("Analytics Dashboard")
-                
-                # Predicted Field Distribution
-                field_counts = df['predicted_field'].value_counts()
-                fig1 = px.pie(field_counts, values=field_counts.values, names=field_counts.index, title="Distribution of Candidate Fields")
-                st.plotly_chart(fig1)
-
-                # Resume Score Distribution
-                fig2 = px.histogram(df, x='resume_score', title='Distribution of Resume Scores')
-                st.plotly_chart(fig2)
-        
-        except Exception as e:
-            st.error(f"An error occurred while fetching data: {e}")
-        finally:
-            conn.close()
+        with connection() as conn:
+            try:
+                dashboard_tab, archive_tab, performance_tab = st.tabs(["Dashboard", "Archive", "Performance"])
+                with dashboard_tab:
+                    # --- Candidate Search ---
+                    search_query = st.text_input("Search resumes", placeholder="e.g. kotlin firebase")
+                    if search_query:
+                        start = time.perf_counter()
+                        matches = search(conn, search_query)
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        st.caption(f"{len(matches)} matches in {elapsed_ms:.1f} ms")
+                        for row_id, name, email, field, score, snippet in matches:
+                            st.markdown(f"**{name}** ({email}) · {field or 'Unclassified'} · score {score:g}  \n{snippet}")
+
+                    # --- Job Description Matching ---
+                    job_description = st.text_area("Match resumes to a job description", placeholder="Paste the job description")
+                    top_k = st.slider("Candidates to show", 5, 50, 10)
+                    if job_description.strip():
+                        start = time.perf_counter()
+                        ranked = match_resumes(conn, job_description, top_k)
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        st.caption(f"{len(ranked)} candidates ranked in {elapsed_ms:.1f} ms")
+                        st.dataframe(pd.DataFrame(ranked, columns=['ID', 'Name', 'Email', 'Field', 'Score', 'Similarity']))
+
+                    # --- Paginated User Data ---
+                    # Keyset pagination: each page starts below the smallest id of the previous one
+                    cursors = st.session_state.setdefault('admin_cursors', [None])
+                    rows = fetch_page(conn, cursors[-1], ADMIN_PAGE_SIZE)
+                    st.dataframe(pd.DataFrame(rows, columns=PAGE_COLUMNS))
+                    prev_col, page_col, next_col = st.columns([1, 1, 1])
+                    page_col.write(f"Page {len(cursors)}")
+                    if prev_col.button("Previous", disabled=len(cursors) == 1):
+                        cursors.pop()
+                        st.rerun()
+                    if next_col.button("Next", disabled=len(rows) < ADMIN_PAGE_SIZE):
+                        cursors.append(rows[-1][0])
+                        st.rerun()
+
+                    # --- Export ---
+                    # Written to a temp file in chunks so the table is never held in memory as a whole
+                    export_col, download_col = st.columns([1, 1])
+                    export_format = export_col.radio("Export format", sorted(EXPORTERS), horizontal=True)
+                    if export_col.button("Prepare export"):
+                        old_export = st.session_state.pop('export_path', None)
+                        if old_export and os.path.exists(old_export):
+                            os.remove(old_export)
+                        fd, export_path = tempfile.mkstemp(suffix=f'.{export_format}')
+                        os.close(fd)
+                        EXPORTERS[export_format](conn, export_path)
+                        st.session_state['export_path'] = export_path
+                    export_path = st.session_state.get('export_path')
+                    if export_path and os.path.exists(export_path):
+                        with open(export_path, 'rb') as f:
+                            download_col.download_button("Download Report", f, file_name='User_Data' + os.path.splitext(export_path)[1])
+
+                    # --- Admin Dashboard Visuals ---
+                    # Plain counts come from the rollup tables; unique counts scan user_data, so they're opt-in
+                    unique = st.checkbox("Count near-duplicate resumes once", value=False)
+                    field_counts = count_by(conn, 'predicted_field', unique)
+                    if field_counts:
+                        st.subheader("Analytics Dashboard")
+                        if unique:
+                            uploads, unique_resumes = count_resumes(conn)
+                            st.write(f"**{unique_resumes}** unique resumes across **{uploads}** uploads.")
+                        else:
+                            st.write(f"**{sum(count for _, count in field_counts)}** uploads.")
+
+                        # Predicted Field Distribution
+                        fields = pd.DataFrame(field_counts, columns=['Field', 'Count'])
+                        fig1 = px.pie(fields, values='Count', names='Field', title="Distribution of Candidate Fields")
+                        st.plotly_chart(fig1)
+
+                        # User Level Distribution
+                        levels = pd.DataFrame(count_by(conn, 'user_level', unique), columns=['Level', 'Count'])
+                        fig2 = px.pie(levels, values='Count', names='Level', title="Distribution of Candidate Levels")
+                        st.plotly_chart(fig2)
+
+                        # Resume Score Distribution
+                        scores = pd.DataFrame(score_histogram(conn), columns=['Score', 'Count'])
+                        fig3 = px.bar(scores, x='Score', y='Count', title='Distribution of Resume Scores')
+                        st.plotly_chart(fig3)
+
+                        # Uploads Over Time
+                        trend = pd.DataFrame(daily_counts(conn, 'predicted_field', TREND_DAYS), columns=['Day', 'Field', 'Uploads'])
+                        fig4 = px.bar(trend, x='Day', y='Uploads', color='Field', title=f"Uploads per Day (last {TREND_DAYS} days)")
+                        st.plotly_chart(fig4)
+
+                        # --- Skills Reports ---
+                        st.subheader("Skills")
+                        skill_query = st.text_input("Count candidates who know a skill", placeholder="e.g. Kotlin")
+                        if skill_query:
+                            st.write(f"**{count_candidates_with_skill(conn, skill_query)}** candidates list {skill_query}.")
+                        report_field = st.selectbox("Field", ["All fields"] + [field for field, _ in field_counts if field])
+                        report_field = None if report_field == "All fields" else report_field
+                        top_skills = pd.DataFrame(skill_frequency(conn, field=report_field), columns=['Skill', 'Candidates'])
+                        st.plotly_chart(px.bar(top_skills, x='Skill', y='Candidates', title='Most Common Skills'))
+                        gaps = pd.DataFrame(skill_gap(conn, report_field), columns=['Skill', 'Candidates Missing It'])
+                        st.plotly_chart(px.bar(gaps, x='Skill', y='Candidates Missing It', title='Recommended Skills Candidates Lack'))
+
+                with archive_tab:
+                    show_archive(conn)
+
+                with performance_tab:
+                    show_performance()
+
+            except Exception as e:
+                st.error(f"An error occurred while fetching data: {e}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,162 @@
+"""Moves old user_data rows into monthly Parquet files and reads them back on demand.
+
+Rows older than the retention window are written to ARCHIVE_DIR/month=YYYY-MM/part-<first id>-<last id>.parquet
+(zstd-compressed, the Export.py schema) and then deleted from user_data, keeping the hot table small.
+Each file is recorded in the `archive_part` table, by its path relative to the archive directory,
+in the same transaction as the delete. A run that dies in between leaves an unrecorded part file,
+which the next run removes.
+
+The same run drops what only served the archived rows: their search index entries, stored text
+and near-duplicate signatures (in the delete transaction), then their match vectors and the PDF
+blobs no remaining row uses.
+
+Reads open only the files of the requested months and decode only the requested columns.
+Dashboard counts (Rollups.py) keep including archived rows.
+
+    python Archive.py --days 365    # archive rows older than a year
+"""
+import argparse
+import contextlib
+import datetime
+import fnmatch
+import os
+import time
+import Dedup
+import Matching
+from Blobs import store as blob_store
+from Export import EXPORT_COLUMNS, parquet_schema, rows_to_table
+from Metrics import traced
+
+ARCHIVE_DIR = 'archive'
+RETENTION_DAYS = 365
+# Rows read from user_data per pass; each pass writes one file per month it touches
+ARCHIVE_BATCH_ROWS = 100000
+
+def create_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive_part (
+            path TEXT PRIMARY KEY,
+            month TEXT NOT NULL,
+            first_id INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,
+            row_count INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_archive_part_month ON archive_part (month)')
+
+# --- Archiving ---
+
+def _write_part(rows, path):
+    import pyarrow.parquet as pq
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + '.partial'
+    pq.write_table(rows_to_table(rows, parquet_schema()), partial, compression='zstd')
+    os.replace(partial, path)
+
+def _part_path(month, first_id, last_id):
+    # Stored relative to the archive directory, so the same files are found however it is spelled
+    return f'month={month}/part-{first_id}-{last_id}.parquet'
+
+def remove_orphans(conn, archive_dir=ARCHIVE_DIR):
+    """Deletes part files that no archive_part row records (left by an interrupted run).
+
+    Only part-*.parquet and *.partial files inside month=*/ folders are ever touched.
+    """
+    recorded = {os.path.normpath(path) for path, in conn.execute("SELECT path FROM archive_part")}
+    if not os.path.isdir(archive_dir):
+        return
+    for month_dir in os.listdir(archive_dir):
+        month_path = os.path.join(archive_dir, month_dir)
+        if not fnmatch.fnmatch(month_dir, 'month=*') or not os.path.isdir(month_path):
+            continue
+        for file_name in os.listdir(month_path):
+            if not (fnmatch.fnmatch(file_name, 'part-*.parquet') or fnmatch.fnmatch(file_name, '*.partial')):
+                continue
+            if os.path.normpath(os.path.join(month_dir, file_name)) not in recorded:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(month_path, file_name))
+
+def _release_blobs(conn, blob_ids, blobs):
+    # A blob's id is its content hash (Blobs.py), so it is still in use while a row has that hash
+    for blob_id in blob_ids:
+        if not conn.execute("SELECT 1 FROM user_data WHERE content_hash = ? LIMIT 1", (blob_id,)).fetchone():
+            blobs.delete(blob_id)
+
+@traced('archive.rows')
+def archive_rows(conn, cutoff, archive_dir=ARCHIVE_DIR, batch_rows=ARCHIVE_BATCH_ROWS, blobs=blob_store):
+    """Moves user_data rows with a timestamp before cutoff ('YYYY-MM-DD') to Parquet; returns rows moved."""
+    remove_orphans(conn, archive_dir)
+    columns = ', '.join(EXPORT_COLUMNS)
+    timestamp_index = EXPORT_COLUMNS.index('timestamp')
+    hash_index = EXPORT_COLUMNS.index('content_hash')
+    blob_index = EXPORT_COLUMNS.index('blob_id')
+    moved = 0
+    while True:
+        rows = conn.execute(f"SELECT {columns} FROM user_data WHERE timestamp < ? ORDER BY id LIMIT ?",
+                            (cutoff, batch_rows)).fetchall()
+        if not rows:
+            # Also catches vectors left by an earlier run that stopped before this point
+            Matching.prune(conn)
+            return moved
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(str(row[timestamp_index])[:7], []).append(row)
+        parts = []
+        for month, month_rows in sorted(by_month.items()):
+            first_id, last_id = month_rows[0][0], month_rows[-1][0]
+            path = _part_path(month, first_id, last_id)
+            _write_part(month_rows, os.path.join(archive_dir, path))
+            parts.append((path, month, first_id, last_id, len(month_rows)))
+        ids = [(row[0],) for row in rows]
+        digests = {row[hash_index] for row in rows if row[hash_index]}
+        with conn:
+            conn.executemany("INSERT INTO archive_part (path, month, first_id, last_id, row_count) VALUES (?, ?, ?, ?, ?)", parts)
+            # Skill links go with the row (ON DELETE CASCADE). The search index needs its own delete,
+            # before the row and its text are gone: it reads the text it removes from resume_doc
+            conn.executemany("DELETE FROM resume_fts WHERE rowid = ?", ids)
+            conn.executemany("DELETE FROM user_data WHERE id = ?", ids)
+            # Stored text and signatures only serve rows still in user_data
+            conn.executemany("DELETE FROM resume_text WHERE content_hash = ? AND content_hash NOT IN (SELECT content_hash FROM user_data)",
+                             [(digest,) for digest in digests])
+            Dedup.remove_unused(conn, digests)
+        _release_blobs(conn, {row[blob_index] for row in rows if row[blob_index]}, blobs)
+        moved += len(rows)
+
+def archive_older_than(conn, days=RETENTION_DAYS, archive_dir=ARCHIVE_DIR):
+    """Archives rows stored more than `days` days ago; returns rows moved."""
+    cutoff = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+    return archive_rows(conn, cutoff, archive_dir)
+
+# --- Reading ---
+
+def archived_months(conn):
+    """Returns [(month, rows)] for every archived month, oldest first."""
+    return conn.execute("SELECT month, SUM(row_count) FROM archive_part GROUP BY month ORDER BY month").fetchall()
+
+@traced('archive.read')
+def read_archive(conn, months, columns=None, archive_dir=ARCHIVE_DIR):
+    """Returns a pyarrow Table of archived rows from the given months, with only the given columns."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = parquet_schema()
+    if columns:
+        schema = pa.schema([schema.field(column) for column in columns])
+    paths = [path for path, in conn.execute(
+        f"SELECT path FROM archive_part WHERE month IN ({', '.join('?' * len(months))}) ORDER BY first_id", list(months)
+    )] if months else []
+    tables = [pq.read_table(os.path.join(archive_dir, path), columns=schema.names) for path in paths]
+    return pa.concat_tables(tables) if tables else schema.empty_table()
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Archive old user_data rows to monthly Parquet files.")
+    parser.add_argument('--days', type=int, default=RETENTION_DAYS, help="keep rows newer than this many days")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    start = time.perf_counter()
+    moved = archive_older_than(conn, args.days, args.archive_dir)
+    print(f"Archived {moved} rows older than {args.days} days in {time.perf_counter() - start:.2f}s")
+    conn.close()
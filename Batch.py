@@ -0,0 +1,107 @@
+"""Headless bulk analysis of a directory of resume PDFs.
+
+Usage:
+    python Batch.py Uploaded_Resumes --workers 4
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Analysis import analyze_many
+from Blobs import store as blob_store
+from Skills import get_matcher
+from Contacts import get_ner
+from Dedup import index_resumes, signature
+from Extraction import MAX_PAGES, MAX_TEXT_CHARS, read_pdf, store_extractions
+from Database import DB_PATH, create_connection, insert_many, migrate, make_row
+
+def init_worker():
+    """Loads the spaCy models and compiles the skill matcher once per worker process."""
+    get_matcher()
+    get_ner()
+
+def analyze_files(paths, fast=False):
+    """Extracts a chunk of PDFs and analyses them together.
+
+    Returns [(path, row, cache_entry, signature, error)]; cache_entry is ready for store_extractions()
+    and signature is the MinHash signature for the near-duplicate index.
+    """
+    results, extracted = [], []
+    for path in paths:
+        try:
+            with open(path, 'rb') as fh:
+                pdf_bytes = fh.read()
+            text, page_count = read_pdf(io.BytesIO(pdf_bytes), MAX_PAGES, MAX_TEXT_CHARS, fast)
+            # The blob id is the content hash, so stored rows link to their PDF
+            extracted.append((path, blob_store.put(pdf_bytes), text, page_count))
+        except Exception as e:
+            results.append((path, None, None, None, str(e)))
+    if not extracted:
+        return results
+    analyses = analyze_many([text for _, _, text, _ in extracted], [page_count for _, _, _, page_count in extracted])
+    for (path, digest, text, page_count), result in zip(extracted, analyses):
+        name = result['name'] or os.path.splitext(os.path.basename(path))[0]
+        row = make_row(name, result['email'], result['resume_score'], result['predicted_field'], result['user_level'],
+                       result['skills'], result['recommended_skills'], result['recommended_courses'], page_count, digest, digest)
+        results.append((path, row, (digest, text, page_count, {}, 0), signature(text), None))
+    return results
+
+def find_pdfs(directory):
+    """Walks a directory and returns the paths of all PDF files under it."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if file_name.lower().endswith('.pdf'):
+                paths.append(os.path.join(root, file_name))
+    return sorted(paths)
+
+def run_batch(directory, workers=None, db_path=DB_PATH, batch_size=500, chunk_size=16, fast=False):
+    """Analyses every PDF under directory and bulk-inserts the results; returns (ok, failed, seconds)."""
+    paths = find_pdfs(directory)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    conn = create_connection(db_path)
+    migrate(conn)
+    ok, failed, pending, cache_entries, signatures = 0, 0, [], [], []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            for results in pool.map(analyze_files, chunks, [fast] * len(chunks)):
+                for path, row, cache_entry, sig, error in results:
+                    if error:
+                        failed += 1
+                        print(f"Failed: {path}: {error}")
+                        continue
+                    ok += 1
+                    pending.append(row)
+                    cache_entries.append(cache_entry)
+                    signatures.append((cache_entry[0], sig))
+                if len(pending) >= batch_size:
+                    insert_many(conn, pending, [text for _, text, _, _, _ in cache_entries])
+                    store_extractions(conn, cache_entries)
+                    index_resumes(conn, signatures)
+                    pending, cache_entries, signatures = [], [], []
+        if pending:
+            insert_many(conn, pending, [text for _, text, _, _, _ in cache_entries])
+            store_extractions(conn, cache_entries)
+            index_resumes(conn, signatures)
+    finally:
+        conn.close()
+    return ok, failed, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse every resume PDF in a directory.")
+    parser.add_argument('directory', nargs='?', default='Uploaded_Resumes')
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database to write user_data rows to")
+    parser.add_argument('--batch-size', type=int, default=500, help="rows per insert transaction")
+    parser.add_argument('--chunk-size', type=int, default=16, help="resumes classified together per worker task")
+    parser.add_argument('--fast', action='store_true', help="skip pdfminer layout analysis")
+    args = parser.parse_args()
+
+    ok, failed, elapsed = run_batch(args.directory, args.workers, args.db, args.batch_size, args.chunk_size, args.fast)
+    rate = ok / elapsed if elapsed else 0.0
+    print(f"Analysed {ok} resumes ({failed} failed) in {elapsed:.2f}s: {rate:.2f} resumes/sec")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""Benchmarks for the analysis pipeline and the Admin queries.
+
+Times every stage on the PDFs in Uploaded_Resumes/ plus generated multi-page resumes, then runs
+the Admin queries against synthetic user_data tables. Each stage reports latency percentiles,
+throughput and the peak RSS so far; results are saved as JSON to compare between commits:
+
+    python Bench.py                                # Admin queries at 10k, 100k and 1M rows
+    python Bench.py --rows 10000 --repeat 5
+    python Bench.py --compare bench_results/old.json bench_results/new.json
+
+Synthetic data comes from a fixed seed, so two runs on the same commit do the same work.
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from Analysis import FIELDS, candidate_level
+from Classifier import classify
+from Contacts import extract_contacts
+from Database import (WriteQueue, count_by, count_candidates_with_skill, count_resumes, create_connection, daily_counts,
+                      fetch_page, insert_many, make_row, migrate, score_histogram, skill_frequency, skill_gap)
+from Extraction import MAX_PAGES, MAX_TEXT_CHARS, read_pdf
+from Matching import match_resumes
+from Scoring import SECTION_SYNONYMS, score
+from Search import search
+from Skills import TAXONOMY, scan
+
+RESULTS_DIR = 'bench_results'
+ROW_COUNTS = [10000, 100000, 1000000]
+# Timed runs per input; the first, untimed run warms caches and lazily loaded models
+REPEAT = 20
+# Pages in the generated resumes, on top of the real ones in Uploaded_Resumes/
+SYNTHETIC_PAGES = [1, 5, 20]
+SEED = 1
+
+# --- Measurement ---
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far in MB, or None where it can't be measured."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))]
+
+def summarize(name, durations, items_per_call=1):
+    """Turns per-call durations (seconds) into a result row."""
+    ordered = sorted(durations)
+    total = sum(ordered)
+    return {
+        'stage': name,
+        'calls': len(ordered),
+        'mean_ms': round(total / len(ordered) * 1000, 3),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 90) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'throughput_per_s': round(len(ordered) * items_per_call / total, 2) if total else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def measure(name, fn, inputs, repeat=REPEAT, items_per_call=1):
+    """Calls fn(*args) repeat times for each args tuple in inputs (after one warm-up call)."""
+    try:
+        fn(*inputs[0])
+    except OSError as e:
+        # e.g. the spaCy model isn't installed
+        print(f"  {name}: skipped ({e})")
+        return {'stage': name, 'skipped': str(e)}
+    durations = []
+    for args in inputs:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(*args)
+            durations.append(time.perf_counter() - start)
+    result = summarize(name, durations, items_per_call)
+    print(f"  {name}: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+          f"{result['throughput_per_s']}/s, peak RSS {result['peak_rss_mb']} MB")
+    return result
+
+# --- Synthetic Data ---
+
+FILLER = ('developed designed implemented led managed improved built tested deployed maintained team project '
+          'application system data users performance features clients results using with for and the').split()
+
+def synthetic_resume_lines(rng, lines):
+    """Resume-like lines: a name, contact details, section headers, skills and filler sentences."""
+    skills = [keyword for keywords in TAXONOMY.values() for keyword in keywords]
+    headers = [synonyms[0].title() for synonyms in SECTION_SYNONYMS.values()]
+    out = [f"Candidate {rng.randrange(10 ** 6)}", f"candidate{rng.randrange(10 ** 6)}@example.com | +1 202 555 {rng.randrange(10 ** 4):04d}"]
+    while len(out) < lines:
+        roll = rng.random()
+        if roll < 0.05:
+            out.append(rng.choice(headers))
+        elif roll < 0.25:
+            out.append('Skills: ' + ', '.join(rng.sample(skills, 4)))
+        else:
+            out.append(' '.join(rng.choice(FILLER) for _ in range(rng.randint(6, 14))).capitalize() + '.')
+    return out
+
+def synthetic_pdf(pages, rng, lines_per_page=50):
+    """Builds a text-only PDF with the given number of pages of resume-like text."""
+    lines = synthetic_resume_lines(rng, pages * lines_per_page)
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in range(pages):
+        page_lines = lines[page * lines_per_page:(page + 1) * lines_per_page]
+        text = ' T* '.join('(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ') Tj'
+                           for line in page_lines)
+        stream = f'BT /F1 10 Tf 14 TL 50 800 Td {text} ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+    pdf, offsets = io.BytesIO(), []
+    pdf.write(b'%PDF-1.4\n')
+    for number, body in enumerate(objects, start=1):
+        offsets.append(pdf.tell())
+        pdf.write(f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1'))
+    xref = pdf.tell()
+    pdf.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1'))
+    for offset in offsets:
+        pdf.write(f'{offset:010d} 00000 n \n'.encode('latin-1'))
+    pdf.write(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1'))
+    return pdf.getvalue()
+
+def synthetic_rows(count, rng):
+    """Yields (row, resume_text) pairs shaped like real uploads."""
+    skills = [keyword for keywords in TAXONOMY.values() for keyword in keywords]
+    fields = list(FIELDS)
+    for _ in range(count):
+        field = rng.choice(fields)
+        page_count = rng.choice([1, 1, 2, 3])
+        name = f"Candidate {rng.randrange(10 ** 7)}"
+        row = make_row(name, f"{name.split()[1]}@example.com", rng.choice(range(0, 101, 20)), field,
+                       candidate_level(page_count), rng.sample(skills, rng.randint(2, 8)),
+                       FIELDS[field]['recommended_skills'], [course for course, _ in FIELDS[field]['courses'][:4]],
+                       page_count, '%064x' % rng.getrandbits(256))
+        yield row, ' '.join(synthetic_resume_lines(rng, 8))
+
+# --- Benchmarks ---
+
+def bench_pipeline(pdf_paths, repeat):
+    """Times each analysis stage on real and generated PDFs."""
+    rng = random.Random(SEED)
+    pdfs = []
+    for path in pdf_paths:
+        with open(path, 'rb') as f:
+            pdfs.append(f.read())
+    pdfs += [synthetic_pdf(pages, rng) for pages in SYNTHETIC_PAGES]
+    extracted = [read_pdf(io.BytesIO(pdf), MAX_PAGES, MAX_TEXT_CHARS) for pdf in pdfs]
+    texts = [(text,) for text, _ in extracted]
+    print(f"Pipeline stages over {len(pdfs)} resumes ({len(pdf_paths)} real, {len(SYNTHETIC_PAGES)} generated):")
+    results = [
+        measure('pdf_reader', lambda pdf: read_pdf(io.BytesIO(pdf), MAX_PAGES, MAX_TEXT_CHARS), [(pdf,) for pdf in pdfs],
+                max(1, repeat // 4)),
+        measure('pdf_reader[fast]', lambda pdf: read_pdf(io.BytesIO(pdf), MAX_PAGES, MAX_TEXT_CHARS, fast=True),
+                [(pdf,) for pdf in pdfs], max(1, repeat // 4)),
+        measure('contacts', extract_contacts, [(text, page_count) for text, page_count in extracted], repeat),
+        measure('skills', scan, texts, repeat),
+        measure('classify', lambda text: classify([text]), texts, repeat),
+        measure('classify[batch]', lambda batch: classify(batch), [([text for text, _ in extracted],)], repeat,
+                len(extracted)),
+        measure('score', score, texts, repeat),
+    ]
+    return results
+
+def bench_insert_data(workdir, count, rng):
+    """Times queueing rows through the background writer and how fast it drains them."""
+    writer = WriteQueue(os.path.join(workdir, 'insert.db'))
+    rows = list(synthetic_rows(count, rng))
+    durations = []
+    start = time.perf_counter()
+    for row, resume_text in rows:
+        put_start = time.perf_counter()
+        writer.put(row, resume_text)
+        durations.append(time.perf_counter() - put_start)
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    result = summarize('insert_data', durations)
+    result['drain_rows_per_s'] = round(count / elapsed, 2)
+    print(f"  insert_data: p50 {result['p50_ms']:.3f} ms to queue, {result['drain_rows_per_s']} rows/s written")
+    return result
+
+def build_database(path, count, rng, batch_size=5000):
+    """Fills a fresh database with synthetic rows; returns seconds taken."""
+    conn = create_connection(path)
+    migrate(conn)
+    start = time.perf_counter()
+    pending = []
+    for row, resume_text in synthetic_rows(count, rng):
+        pending.append((row, resume_text))
+        if len(pending) == batch_size:
+            insert_many(conn, [r for r, _ in pending], [t for _, t in pending])
+            pending = []
+    if pending:
+        insert_many(conn, [r for r, _ in pending], [t for _, t in pending])
+    conn.close()
+    return time.perf_counter() - start
+
+def bench_admin(workdir, rows, repeat):
+    """Times the Admin page queries against a synthetic user_data table of the given size."""
+    path = os.path.join(workdir, f'admin-{rows}.db')
+    built = build_database(path, rows, random.Random(SEED))
+    print(f"Admin queries at {rows} rows (built in {built:.1f}s, {rows / built:.0f} rows/s):")
+    conn = create_connection(path)
+    middle_id = rows // 2
+    queries = [
+        ('count_by[predicted_field]', lambda: count_by(conn, 'predicted_field')),
+        ('count_by[user_level]', lambda: count_by(conn, 'user_level')),
+        ('count_by[unique]', lambda: count_by(conn, 'predicted_field', unique=True)),
+        ('count_resumes', lambda: count_resumes(conn)),
+        ('score_histogram', lambda: score_histogram(conn)),
+        ('daily_counts', lambda: daily_counts(conn, 'predicted_field', 90)),
+        ('fetch_page[first]', lambda: fetch_page(conn)),
+        ('fetch_page[middle]', lambda: fetch_page(conn, middle_id)),
+        ('count_candidates_with_skill', lambda: count_candidates_with_skill(conn, 'python')),
+        ('skill_frequency', lambda: skill_frequency(conn)),
+        ('skill_frequency[field]', lambda: skill_frequency(conn, field='Data Science')),
+        ('skill_gap', lambda: skill_gap(conn, 'Data Science')),
+        ('search', lambda: search(conn, 'flask developer')),
+        ('match_resumes', lambda: match_resumes(conn, 'Data scientist with tensorflow, keras and flask')),
+    ]
+    results = []
+    for name, query in queries:
+        result = measure(name, query, [()], repeat)
+        result['rows'] = rows
+        results.append(result)
+    conn.close()
+    return {'rows': rows, 'build_seconds': round(built, 2), 'build_rows_per_s': round(rows / built, 2),
+            'queries': results}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(pdf_dir='Uploaded_Resumes', row_counts=ROW_COUNTS, repeat=REPEAT, insert_rows=2000):
+    """Runs every benchmark and returns the results as a JSON-ready dict."""
+    pdf_paths = sorted(os.path.join(pdf_dir, name) for name in os.listdir(pdf_dir) if name.lower().endswith('.pdf'))
+    workdir = tempfile.mkdtemp(prefix='sra-bench-')
+    try:
+        results = {
+            'commit': git_commit(),
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'pipeline': bench_pipeline(pdf_paths, repeat),
+        }
+        results['pipeline'].append(bench_insert_data(workdir, insert_rows, random.Random(SEED)))
+        results['admin'] = [bench_admin(workdir, rows, repeat) for rows in row_counts]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+# --- Comparison ---
+
+def _by_stage(results):
+    stages = {('pipeline', row['stage']): row for row in results['pipeline']}
+    for admin in results.get('admin', []):
+        stages.update({(f"admin@{admin['rows']}", row['stage']): row for row in admin['queries']})
+    return stages
+
+def compare(old, new):
+    """Prints the p50/p99 change of every stage present in both result files."""
+    old_stages, new_stages = _by_stage(old), _by_stage(new)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for key in new_stages:
+        before, after = old_stages.get(key), new_stages[key]
+        if not before or 'p50_ms' not in before or 'p50_ms' not in after:
+            continue
+        change = (after['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        print(f"{key[0]:>16} {key[1]:<28} p50 {before['p50_ms']:>9.3f} -> {after['p50_ms']:>9.3f} ms ({change:+.1f}%)"
+              f"  p99 {before['p99_ms']:>9.3f} -> {after['p99_ms']:>9.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline and Admin queries.")
+    parser.add_argument('--pdfs', default='Uploaded_Resumes', help="directory of real resumes to time")
+    parser.add_argument('--rows', type=int, nargs='*', default=ROW_COUNTS, help="user_data sizes for the Admin queries")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed runs per input")
+    parser.add_argument('--insert-rows', type=int, default=2000, help="rows queued through insert_data")
+    parser.add_argument('--output', help=f"JSON results path (default: {RESULTS_DIR}/<commit>-<time>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two saved result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            compare(json.load(f_old), json.load(f_new))
+        return
+    results = run(args.pdfs, args.rows, args.repeat, args.insert_rows)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{results['commit'] or 'unknown'}-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Peak RSS {results['peak_rss_mb']} MB; results saved to {output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Content-addressed store for uploaded resume PDFs.
+
+A PDF's blob id is the SHA-256 of its bytes (the same digest as Extraction.content_hash), and it
+is stored once at BLOB_DIR/<id[:2]>/<id[2:4]>/<id>, gzip-compressed with a `.gz` suffix when
+compression is on. Identical uploads are written once however many users send them, and file
+names never collide. user_data.blob_id links an analysed row to its PDF.
+
+Uploads are streamed through the hash and the compressor in chunks into a temporary file, which
+is renamed into place, so readers never see a partial blob and concurrent writers of the same
+content don't conflict.
+
+    python Blobs.py Uploaded_Resumes    # store every PDF in a folder
+"""
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import os
+import tempfile
+import time
+import zlib
+from Metrics import traced
+
+BLOB_DIR = 'resume_blobs'
+CHUNK_SIZE = 1024 * 1024
+# PDFs are mostly compressed streams already, so a cheap level gets nearly all of the saving
+COMPRESS_LEVEL = 3
+BLOB_COMPRESS = os.environ.get('SRA_BLOB_COMPRESS', '1') != '0'
+
+class BlobStore:
+    """Sharded, deduplicated files addressed by the SHA-256 of their content."""
+
+    def __init__(self, directory=BLOB_DIR, compress=BLOB_COMPRESS):
+        self.directory = directory
+        self.compress = compress
+
+    def _shard(self, blob_id):
+        return os.path.join(self.directory, blob_id[:2], blob_id[2:4])
+
+    def path(self, blob_id):
+        """Returns the blob's file path, or None if it isn't stored (compressed or not)."""
+        for suffix in ('.gz', ''):
+            path = os.path.join(self._shard(blob_id), blob_id + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def __contains__(self, blob_id):
+        return self.path(blob_id) is not None
+
+    @traced('blob.put')
+    def put_stream(self, fh, chunk_size=CHUNK_SIZE):
+        """Stores the content of a binary stream; returns (blob id, size in bytes)."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix='.partial')
+        digest, size = hashlib.sha256(), 0
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                # wbits=31 writes the gzip container, so blobs also open with gzip/zcat
+                compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31) if self.compress else None
+                while chunk := fh.read(chunk_size):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(compressor.compress(chunk) if compressor else chunk)
+                if compressor:
+                    out.write(compressor.flush())
+            blob_id = digest.hexdigest()
+            if blob_id in self:
+                os.remove(partial)
+            else:
+                os.makedirs(self._shard(blob_id), exist_ok=True)
+                os.replace(partial, os.path.join(self._shard(blob_id), blob_id + ('.gz' if self.compress else '')))
+            return blob_id, size
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+            raise
+
+    def put(self, data):
+        """Stores bytes; returns the blob id."""
+        return self.put_stream(io.BytesIO(data))[0]
+
+    def open(self, blob_id):
+        """Opens a stored blob for reading its original bytes."""
+        path = self.path(blob_id)
+        if path is None:
+            raise FileNotFoundError(f"No blob {blob_id}")
+        return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+    def delete(self, blob_id):
+        """Removes a stored blob (compressed or not); a missing blob is not an error."""
+        for suffix in ('.gz', ''):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self._shard(blob_id), blob_id + suffix))
+
+    def get(self, blob_id):
+        """Returns a stored blob's original bytes."""
+        with self.open(blob_id) as fh:
+            return fh.read()
+
+store = BlobStore()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Store resume PDFs in the content-addressed blob store.")
+    parser.add_argument('directory', help="folder of PDFs to store")
+    parser.add_argument('--blob-dir', default=BLOB_DIR)
+    parser.add_argument('--no-compress', action='store_true')
+    args = parser.parse_args()
+    blobs = BlobStore(args.blob_dir, compress=not args.no_compress)
+    start, stored, total = time.perf_counter(), set(), 0
+    for root, _, files in os.walk(args.directory):
+        for file_name in sorted(files):
+            if file_name.lower().endswith('.pdf'):
+                with open(os.path.join(root, file_name), 'rb') as fh:
+                    blob_id, size = blobs.put_stream(fh)
+                stored.add(blob_id)
+                total += size
+    print(f"Stored {len(stored)} distinct PDFs ({total / 1024 / 1024:.1f} MB read) in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,67 @@
+import re
+import numpy as np
+from Skills import TAXONOMY
+
+TOKEN_RE = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9]+)*')
+# Sharpness of the softmax that turns cosine scores into field probabilities
+TEMPERATURE = 10.0
+
+FIELD_NAMES = list(TAXONOMY)
+
+# --- Vectorizer ---
+
+def analyze(text):
+    """Lowercases and tokenizes text into unigram and bigram terms."""
+    tokens = TOKEN_RE.findall(text.lower())
+    return tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+
+def _build_model():
+    vocabulary = {}
+    field_terms = []
+    for keywords in TAXONOMY.values():
+        terms = [term for keyword in keywords for term in analyze(keyword)]
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+        field_terms.append(terms)
+    counts = np.zeros((len(FIELD_NAMES), len(vocabulary)), dtype=np.float32)
+    for row, terms in enumerate(field_terms):
+        for term in terms:
+            counts[row, vocabulary[term]] += 1
+    # Terms shared by several fields (e.g. flask) carry less weight
+    df = np.count_nonzero(counts, axis=0)
+    idf = (np.log((1 + len(FIELD_NAMES)) / (1 + df)) + 1).astype(np.float32)
+    return vocabulary, idf, _normalize(np.log1p(counts) * idf)
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+VOCABULARY, IDF, CENTROIDS = _build_model()
+
+def vectorize(texts):
+    """Returns an (n_texts, n_terms) matrix of L2-normalised TF-IDF vectors over the taxonomy vocabulary."""
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        hits = [VOCABULARY[term] for term in analyze(text) if term in VOCABULARY]
+        rows.extend([row] * len(hits))
+        cols.extend(hits)
+    counts = np.zeros((len(texts), len(VOCABULARY)), dtype=np.float32)
+    np.add.at(counts, (rows, cols), 1)
+    return _normalize(np.log1p(counts) * IDF)
+
+# --- Classification ---
+
+def classify(texts):
+    """Scores a batch of resume texts against every field in one matrix multiply.
+
+    Returns (probabilities, matched): an (n_texts, n_fields) array ordered like
+    FIELD_NAMES and a boolean array marking texts that hit any taxonomy term.
+    """
+    scores = vectorize(texts) @ CENTROIDS.T
+    exp = np.exp(TEMPERATURE * (scores - scores.max(axis=1, keepdims=True)))
+    return exp / exp.sum(axis=1, keepdims=True), scores.max(axis=1) > 0
+
+def rank_fields(probabilities):
+    """Turns one row of classify() probabilities into [(field, probability)], best first."""
+    order = np.argsort(probabilities)[::-1]
+    return [(FIELD_NAMES[i], float(probabilities[i])) for i in order]
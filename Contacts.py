@@ -0,0 +1,94 @@
+"""Contact details from already extracted resume text.
+
+Email and phone come from precompiled regexes over the whole text. The name comes from a spaCy
+NER pass over the top of the first page only (pdfminer ends every page with a form feed), with a
+capitalised line near the top as the fallback, so no second PDF parse or full NLP pipeline is needed.
+"""
+import re
+from Models import get_nlp
+
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+# Optional country code and area code, then digit groups; candidates are checked by digit count
+PHONE_RE = re.compile(r'(?<!\d)(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d[\d\s.-]{6,16}\d(?!\d)')
+PHONE_DIGITS = range(10, 16)
+# Digit groups of a date range or year list ("01.2019 - 12.2023", "2019 2020 2021"): days, months and years
+DATE_GROUP_RE = re.compile(r'\d{1,2}|(?:19|20)\d{2}')
+YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+# Names sit at the top of a resume; NER reads no further than this into the first page
+NAME_SEARCH_CHARS = 1000
+# The line fallback only looks at this many non-empty lines from the top of the first page
+NAME_FALLBACK_LINES = 5
+# A capitalised name word: Smith, McDonald, O'Brien, Anne-Marie, J., or the same in capitals (SMITH)
+NAME_WORD_RE = re.compile(r"[A-Z][a-z]*(?:['’-]?[A-Z]?[a-z]+)*\.?|[A-Z]+(?:['’-][A-Z]+)*\.?")
+# Words of the job titles and headers that share the top lines with the name ("Data Scientist", "Curriculum Vitae")
+NOT_NAME_WORDS = frozenset('''
+    resume résumé curriculum vitae cv biodata profile contact details personal information summary objective
+    experience education skills projects work history
+    developer engineer scientist designer analyst manager consultant architect administrator director
+    specialist officer executive assistant intern trainee lead senior junior head coordinator programmer
+    tester student graduate freelancer associate technician accountant teacher writer editor
+    data software web mobile android ios frontend backend full stack devops cloud marketing sales graphic
+    product project business research
+'''.split())
+
+def first_page(resume_text):
+    """Returns the text of the first page."""
+    return resume_text.split('\f', 1)[0]
+
+def find_email(resume_text):
+    match = EMAIL_RE.search(resume_text)
+    return match.group(0) if match else ''
+
+def _is_date_run(groups):
+    return any(YEAR_RE.fullmatch(group) for group in groups) and all(DATE_GROUP_RE.fullmatch(group) for group in groups)
+
+def is_phone(candidate):
+    """True for a PHONE_RE match with a phone's digit count that isn't a run of dates or years."""
+    groups = re.findall(r'\d+', candidate)
+    return sum(map(len, groups)) in PHONE_DIGITS and not _is_date_run(groups)
+
+def find_phone(resume_text):
+    for match in PHONE_RE.finditer(resume_text):
+        phone = match.group(0).strip()
+        if is_phone(phone):
+            return phone
+    return ''
+
+def _is_name(text):
+    return 0 < len(text.split()) <= 4 and not re.search(r'[@\d]', text)
+
+def _is_name_line(line):
+    # Sentences and lower-case headers ("experience", "art director & graphic designer") aren't capitalised;
+    # job titles and document headers ("Android Developer", "Curriculum Vitae") are ruled out by their words
+    words = line.split()
+    return (len(words) >= 2 and _is_name(line) and all(NAME_WORD_RE.fullmatch(word) for word in words)
+            and not any(word.lower().strip('.') in NOT_NAME_WORDS for word in words))
+
+def get_ner():
+    """Returns the NER-only spaCy pipeline, or None when the model isn't installed."""
+    try:
+        return get_nlp('ner')
+    except OSError:
+        return None
+
+def find_name(page_text):
+    """Returns the first PERSON entity near the top of the page, else a capitalised line there that isn't
+    a job title or header, else ''."""
+    nlp = get_ner()
+    # Without the model the line heuristic alone still finds most names
+    if nlp is not None:
+        for ent in nlp(page_text[:NAME_SEARCH_CHARS]).ents:
+            name = ' '.join(ent.text.split())
+            if ent.label_ == 'PERSON' and _is_name(name):
+                return name
+    top_lines = [line.strip() for line in page_text.splitlines() if line.strip()][:NAME_FALLBACK_LINES]
+    return next((line for line in top_lines if _is_name_line(line)), '')
+
+def extract_contacts(resume_text, page_count):
+    """Returns {'name', 'email', 'phone', 'page_count'} for extracted resume text."""
+    return {
+        'name': find_name(first_page(resume_text)),
+        'email': find_email(resume_text),
+        'phone': find_phone(resume_text),
+        'page_count': page_count,
+    }
@@ -1,56 +1,177 @@
-ds_course = [['Machine Learning Crash Course by Google [Free]', 'https://developers.google.com/machine-learning/crash-course'],
-             ['Machine Learning A-Z by Udemy','https://www.udemy.com/course/machinelearning/'],
-             ['Machine Learning by Andrew NG','https://www.coursera.org/learn/machine-learning'],
-             ['Data Scientist Master Program of Simplilearn (IBM)','https://www.simplilearn.com/big-data-and-analytics/senior-data-scientist-masters-program-training'],
-             ['Data Science Foundations: Fundamentals by LinkedIn','https://www.linkedin.com/learning/data-science-foundations-fundamentals-5'],
-             ['Data Scientist with Python','https://www.datacamp.com/tracks/data-scientist-with-python'],
-             ['Programming for Data Science with Python','https://www.udacity.com/course/programming-for-data-science-nanodegree--nd104'],
-             ['Programming for Data Science with R','https://www.udacity.com/course/programming-for-data-science-nanodegree-with-R--nd118'],
-             ['Introduction to Data Science','https://www.udacity.com/course/introduction-to-data-science--cd0017'],
-             ['Intro to Machine Learning with TensorFlow','https://www.udacity.com/course/intro-to-machine-learning-with-tensorflow-nanodegree--nd230']]
-
-web_course = [['Django Crash course [Free]','https://youtu.be/e1IyzVyrLSU'],
-              ['Python and Django Full Stack Web Developer Bootcamp','https://www.udemy.com/course/python-and-django-full-stack-web-developer-bootcamp'],
-              ['React Crash Course [Free]','https://youtu.be/Dorf8i6lCuk'],
-              ['ReactJS Project Development Training','https://www.dotnettricks.com/training/masters-program/reactjs-certification-training'],
-              ['Full Stack Web Developer - MEAN Stack','https://www.simplilearn.com/full-stack-web-developer-mean-stack-certification-training'],
-              ['Node.js and Express.js [Free]','https://youtu.be/Oe421EPjeBE'],
-              ['Flask: Develop Web Applications in Python','https://www.educative.io/courses/flask-develop-web-applications-in-python'],
-              ['Full Stack Web Developer by Udacity','https://www.udacity.com/course/full-stack-web-developer-nanodegree--nd0044'],
-              ['Front End Web Developer by Udacity','https://www.udacity.com/course/front-end-web-developer-nanodegree--nd0011'],
-              ['Become a React Developer by Udacity','https://www.udacity.com/course/react-nanodegree--nd019']]
-
-android_course = [['Android Development for Beginners [Free]','https://youtu.be/fis26HvvDII'],
-                  ['Android App Development Specialization','https://www.coursera.org/specializations/android-app-development'],
-                  ['Associate Android Developer Certification','https://grow.google/androiddev/#?modal_active=none'],
-                  ['Become an Android Kotlin Developer by Udacity','https://www.udacity.com/course/android-kotlin-developer-nanodegree--nd940'],
-                  ['Android Basics by Google','https://www.udacity.com/course/android-basics-nanodegree-by-google--nd803'],
-                  ['The Complete Android Developer Course','https://www.udemy.com/course/complete-android-n-developer-course/'],
-                  ['Building an Android App with Architecture Components','https://www.linkedin.com/learning/building-an-android-app-with-architecture-components'],
-                  ['Android App Development Masterclass using Kotlin','https://www.udemy.com/course/android-oreo-kotlin-app-masterclass/'],
-                  ['Flutter & Dart - The Complete Flutter App Development Course','https://www.udemy.com/course/flutter-dart-the-complete-flutter-app-development-course/'],
-                  ['Flutter App Development Course [Free]','https://youtu.be/rZLR5olMR64']]
-
-ios_course = [['IOS App Development by LinkedIn','https://www.linkedin.com/learning/subscription/topics/ios'],
-              ['iOS & Swift - The Complete iOS App Development Bootcamp','https://www.udemy.com/course/ios-13-app-development-bootcamp/'],
-              ['Become an iOS Developer','https://www.udacity.com/course/ios-developer-nanodegree--nd003'],
-              ['iOS App Development with Swift Specialization','https://www.coursera.org/specializations/app-development'],
-              ['Mobile App Development with Swift','https://www.edx.org/professional-certificate/curtinx-mobile-app-development-with-swift'],
-              ['Swift Course by LinkedIn','https://www.linkedin.com/learning/subscription/topics/swift-2'],
-              ['Objective-C Crash Course for Swift Developers','https://www.udemy.com/course/objectivec/'],
-              ['Learn Swift by Codecademy','https://www.codecademy.com/learn/learn-swift'],
-              ['Swift Tutorial - Full Course for Beginners [Free]','https://youtu.be/comQ1-x2a1Q'],
-              ['Learn Swift Fast - [Free]','https://youtu.be/FcsY1YPBwzQ']]
-uiux_course = [['Google UX Design Professional Certificate','https://www.coursera.org/professional-certificates/google-ux-design'],
-               ['UI / UX Design Specialization','https://www.coursera.org/specializations/ui-ux-design'],
-               ['The Complete App Design Course - UX, UI and Design Thinking','https://www.udemy.com/course/the-complete-app-design-course-ux-and-ui-design/'],
-               ['UX & Web Design Master Course: Strategy, Design, Development','https://www.udemy.com/course/ux-web-design-master-course-strategy-design-development/'],
-               ['The Complete App Design Course - UX, UI and Design Thinking','https://www.udemy.com/course/the-complete-app-design-course-ux-and-ui-design/'],
-               ['DESIGN RULES: Principles + Practices for Great UI Design','https://www.udemy.com/course/design-rules/'],
-               ['Become a UX Designer by Udacity','https://www.udacity.com/course/ux-designer-nanodegree--nd578'],
-               ['Adobe XD Tutorial: User Experience Design Course [Free]','https://youtu.be/68w2VwalD5w'],
-               ['Adobe XD for Beginners [Free]','https://youtu.be/WEljsc2jorI'],
-               ['Adobe XD in Simple Way','https://learnux.io/course/adobe-xd']]
+"""Course catalog and skill-gap course recommendations.
+
+Every course is tagged with its field and the skills it teaches (lower case, in the vocabulary of
+Analysis.FIELDS recommended skills and Skills.TAXONOMY). The catalog is indexed once at import into
+skill -> courses; recommend() ranks courses by how many of a candidate's missing skills they cover.
+The catalog and index are immutable, so concurrent sessions share them safely.
+"""
+
+# --- Catalog ---
+
+COURSES = (
+    # Data Science
+    {'name': 'Machine Learning Crash Course by Google [Free]', 'url': 'https://developers.google.com/machine-learning/crash-course',
+     'field': 'Data Science', 'skills': ('machine learning', 'ml algorithms', 'tensorflow', 'clustering & classification')},
+    {'name': 'Machine Learning A-Z by Udemy', 'url': 'https://www.udemy.com/course/machinelearning/',
+     'field': 'Data Science', 'skills': ('machine learning', 'ml algorithms', 'clustering & classification', 'predictive analysis', 'scikit-learn')},
+    {'name': 'Machine Learning by Andrew NG', 'url': 'https://www.coursera.org/learn/machine-learning',
+     'field': 'Data Science', 'skills': ('machine learning', 'ml algorithms', 'clustering & classification', 'probability')},
+    {'name': 'Data Scientist Master Program of Simplilearn (IBM)', 'url': 'https://www.simplilearn.com/big-data-and-analytics/senior-data-scientist-masters-program-training',
+     'field': 'Data Science', 'skills': ('data analytics', 'data mining', 'statistical modeling', 'predictive analysis', 'data visualization', 'quantitative analysis')},
+    {'name': 'Data Science Foundations: Fundamentals by LinkedIn', 'url': 'https://www.linkedin.com/learning/data-science-foundations-fundamentals-5',
+     'field': 'Data Science', 'skills': ('data analytics', 'data mining', 'statistical modeling', 'probability')},
+    {'name': 'Data Scientist with Python', 'url': 'https://www.datacamp.com/tracks/data-scientist-with-python',
+     'field': 'Data Science', 'skills': ('data visualization', 'data analytics', 'web scraping', 'scikit-learn', 'statistical modeling')},
+    {'name': 'Programming for Data Science with Python', 'url': 'https://www.udacity.com/course/programming-for-data-science-nanodegree--nd104',
+     'field': 'Data Science', 'skills': ('data analytics', 'data visualization', 'quantitative analysis')},
+    {'name': 'Programming for Data Science with R', 'url': 'https://www.udacity.com/course/programming-for-data-science-nanodegree-with-R--nd118',
+     'field': 'Data Science', 'skills': ('data analytics', 'data visualization', 'statistical modeling')},
+    {'name': 'Introduction to Data Science', 'url': 'https://www.udacity.com/course/introduction-to-data-science--cd0017',
+     'field': 'Data Science', 'skills': ('data analytics', 'data visualization', 'data mining')},
+    {'name': 'Intro to Machine Learning with TensorFlow', 'url': 'https://www.udacity.com/course/intro-to-machine-learning-with-tensorflow-nanodegree--nd230',
+     'field': 'Data Science', 'skills': ('machine learning', 'deep learning', 'tensorflow', 'keras', 'scikit-learn')},
+    # Web Development
+    {'name': 'Django Crash course [Free]', 'url': 'https://youtu.be/e1IyzVyrLSU',
+     'field': 'Web Development', 'skills': ('django',)},
+    {'name': 'Python and Django Full Stack Web Developer Bootcamp', 'url': 'https://www.udemy.com/course/python-and-django-full-stack-web-developer-bootcamp',
+     'field': 'Web Development', 'skills': ('django', 'javascript')},
+    {'name': 'React Crash Course [Free]', 'url': 'https://youtu.be/Dorf8i6lCuk',
+     'field': 'Web Development', 'skills': ('react', 'react js', 'javascript')},
+    {'name': 'ReactJS Project Development Training', 'url': 'https://www.dotnettricks.com/training/masters-program/reactjs-certification-training',
+     'field': 'Web Development', 'skills': ('react', 'react js', 'javascript')},
+    {'name': 'Full Stack Web Developer - MEAN Stack', 'url': 'https://www.simplilearn.com/full-stack-web-developer-mean-stack-certification-training',
+     'field': 'Web Development', 'skills': ('angular js', 'node js', 'javascript')},
+    {'name': 'Node.js and Express.js [Free]', 'url': 'https://youtu.be/Oe421EPjeBE',
+     'field': 'Web Development', 'skills': ('node js', 'javascript')},
+    {'name': 'Flask: Develop Web Applications in Python', 'url': 'https://www.educative.io/courses/flask-develop-web-applications-in-python',
+     'field': 'Web Development', 'skills': ('flask',)},
+    {'name': 'Full Stack Web Developer by Udacity', 'url': 'https://www.udacity.com/course/full-stack-web-developer-nanodegree--nd0044',
+     'field': 'Web Development', 'skills': ('flask', 'javascript')},
+    {'name': 'Front End Web Developer by Udacity', 'url': 'https://www.udacity.com/course/front-end-web-developer-nanodegree--nd0011',
+     'field': 'Web Development', 'skills': ('javascript',)},
+    {'name': 'Become a React Developer by Udacity', 'url': 'https://www.udacity.com/course/react-nanodegree--nd019',
+     'field': 'Web Development', 'skills': ('react', 'react js', 'javascript')},
+    # Android Development
+    {'name': 'Android Development for Beginners [Free]', 'url': 'https://youtu.be/fis26HvvDII',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'java', 'xml')},
+    {'name': 'Android App Development Specialization', 'url': 'https://www.coursera.org/specializations/android-app-development',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'java', 'sqlite')},
+    {'name': 'Associate Android Developer Certification', 'url': 'https://grow.google/androiddev/#?modal_active=none',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'kotlin')},
+    {'name': 'Become an Android Kotlin Developer by Udacity', 'url': 'https://www.udacity.com/course/android-kotlin-developer-nanodegree--nd940',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'kotlin')},
+    {'name': 'Android Basics by Google', 'url': 'https://www.udacity.com/course/android-basics-nanodegree-by-google--nd803',
+     'field': 'Android Development', 'skills': ('android', 'java', 'xml')},
+    {'name': 'The Complete Android Developer Course', 'url': 'https://www.udemy.com/course/complete-android-n-developer-course/',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'java', 'sqlite')},
+    {'name': 'Building an Android App with Architecture Components', 'url': 'https://www.linkedin.com/learning/building-an-android-app-with-architecture-components',
+     'field': 'Android Development', 'skills': ('android', 'kotlin', 'sqlite')},
+    {'name': 'Android App Development Masterclass using Kotlin', 'url': 'https://www.udemy.com/course/android-oreo-kotlin-app-masterclass/',
+     'field': 'Android Development', 'skills': ('android', 'android development', 'kotlin')},
+    {'name': 'Flutter & Dart - The Complete Flutter App Development Course', 'url': 'https://www.udemy.com/course/flutter-dart-the-complete-flutter-app-development-course/',
+     'field': 'Android Development', 'skills': ('flutter',)},
+    {'name': 'Flutter App Development Course [Free]', 'url': 'https://youtu.be/rZLR5olMR64',
+     'field': 'Android Development', 'skills': ('flutter',)},
+    # IOS Development
+    {'name': 'IOS App Development by LinkedIn', 'url': 'https://www.linkedin.com/learning/subscription/topics/ios',
+     'field': 'IOS Development', 'skills': ('ios', 'ios development', 'swift', 'xcode')},
+    {'name': 'iOS & Swift - The Complete iOS App Development Bootcamp', 'url': 'https://www.udemy.com/course/ios-13-app-development-bootcamp/',
+     'field': 'IOS Development', 'skills': ('ios', 'ios development', 'swift', 'xcode', 'ui-kit', 'auto-layout')},
+    {'name': 'Become an iOS Developer', 'url': 'https://www.udacity.com/course/ios-developer-nanodegree--nd003',
+     'field': 'IOS Development', 'skills': ('ios development', 'swift', 'ui-kit', 'av foundation')},
+    {'name': 'iOS App Development with Swift Specialization', 'url': 'https://www.coursera.org/specializations/app-development',
+     'field': 'IOS Development', 'skills': ('ios', 'swift', 'xcode', 'ui-kit')},
+    {'name': 'Mobile App Development with Swift', 'url': 'https://www.edx.org/professional-certificate/curtinx-mobile-app-development-with-swift',
+     'field': 'IOS Development', 'skills': ('ios development', 'swift', 'xcode')},
+    {'name': 'Swift Course by LinkedIn', 'url': 'https://www.linkedin.com/learning/subscription/topics/swift-2',
+     'field': 'IOS Development', 'skills': ('swift',)},
+    {'name': 'Objective-C Crash Course for Swift Developers', 'url': 'https://www.udemy.com/course/objectivec/',
+     'field': 'IOS Development', 'skills': ('objective-c', 'cocoa')},
+    {'name': 'Learn Swift by Codecademy', 'url': 'https://www.codecademy.com/learn/learn-swift',
+     'field': 'IOS Development', 'skills': ('swift',)},
+    {'name': 'Swift Tutorial - Full Course for Beginners [Free]', 'url': 'https://youtu.be/comQ1-x2a1Q',
+     'field': 'IOS Development', 'skills': ('swift', 'xcode')},
+    {'name': 'Learn Swift Fast - [Free]', 'url': 'https://youtu.be/FcsY1YPBwzQ',
+     'field': 'IOS Development', 'skills': ('swift',)},
+    # UI-UX Development
+    {'name': 'Google UX Design Professional Certificate', 'url': 'https://www.coursera.org/professional-certificates/google-ux-design',
+     'field': 'UI-UX Development', 'skills': ('user experience', 'user research', 'wireframes', 'prototyping', 'figma', 'adobe xd')},
+    {'name': 'UI / UX Design Specialization', 'url': 'https://www.coursera.org/specializations/ui-ux-design',
+     'field': 'UI-UX Development', 'skills': ('ui', 'user experience', 'wireframes', 'prototyping', 'user research')},
+    {'name': 'The Complete App Design Course - UX, UI and Design Thinking', 'url': 'https://www.udemy.com/course/the-complete-app-design-course-ux-and-ui-design/',
+     'field': 'UI-UX Development', 'skills': ('ui', 'user experience', 'prototyping', 'wireframe', 'figma')},
+    {'name': 'UX & Web Design Master Course: Strategy, Design, Development', 'url': 'https://www.udemy.com/course/ux-web-design-master-course-strategy-design-development/',
+     'field': 'UI-UX Development', 'skills': ('ui', 'user experience', 'wireframes', 'prototyping', 'adobe xd')},
+    {'name': 'DESIGN RULES: Principles + Practices for Great UI Design', 'url': 'https://www.udemy.com/course/design-rules/',
+     'field': 'UI-UX Development', 'skills': ('ui',)},
+    {'name': 'Become a UX Designer by Udacity', 'url': 'https://www.udacity.com/course/ux-designer-nanodegree--nd578',
+     'field': 'UI-UX Development', 'skills': ('user experience', 'user research', 'prototyping', 'wireframes')},
+    {'name': 'Adobe XD Tutorial: User Experience Design Course [Free]', 'url': 'https://youtu.be/68w2VwalD5w',
+     'field': 'UI-UX Development', 'skills': ('adobe xd', 'user experience', 'prototyping')},
+    {'name': 'Adobe XD for Beginners [Free]', 'url': 'https://youtu.be/WEljsc2jorI',
+     'field': 'UI-UX Development', 'skills': ('adobe xd',)},
+    {'name': 'Adobe XD in Simple Way', 'url': 'https://learnux.io/course/adobe-xd',
+     'field': 'UI-UX Development', 'skills': ('adobe xd', 'prototyping')},
+)
+
+# Spellings in resumes and recommendations that mean the same catalog skill
+SKILL_ALIASES = {'node.js': 'node js', 'nodejs': 'node js', 'react.js': 'react js', 'reactjs': 'react js',
+                 'angularjs': 'angular js', 'photoshop': 'adobe photoshop', 'wireframe': 'wireframes',
+                 'ux': 'user experience'}
+
+def normalize_skill(skill):
+    """Maps a skill name to the catalog's spelling."""
+    skill = ' '.join(skill.lower().split())
+    return SKILL_ALIASES.get(skill, skill)
+
+def _build_index(courses):
+    index = {}
+    for position, course in enumerate(courses):
+        for skill in course['skills']:
+            index.setdefault(normalize_skill(skill), []).append(position)
+    return {skill: tuple(positions) for skill, positions in index.items()}
+
+SKILL_INDEX = _build_index(COURSES)
+
+def field_courses(field):
+    """Returns ((name, url), ...) for a field's courses in catalog order."""
+    return tuple((course['name'], course['url']) for course in COURSES if course['field'] == field)
+
+# Per-field lists kept for existing imports
+ds_course = field_courses('Data Science')
+web_course = field_courses('Web Development')
+android_course = field_courses('Android Development')
+ios_course = field_courses('IOS Development')
+uiux_course = field_courses('UI-UX Development')
+
+# --- Recommendations ---
+
+def missing_skills(recommended, have):
+    """Returns the recommended skills (normalised, in order) the candidate doesn't list."""
+    have = {normalize_skill(skill) for skill in have}
+    missing = []
+    for skill in map(normalize_skill, recommended):
+        if skill not in have and skill not in missing:
+            missing.append(skill)
+    return missing
+
+def recommend(missing, field=None, count=4):
+    """Ranks courses by how many missing skills they cover; returns [(name, url)].
+
+    Ties go to courses in the candidate's field, then catalog order. When too few courses cover a
+    gap, the rest of the list is filled with the field's courses so it never comes back short.
+    """
+    covered = {}
+    for skill in set(map(normalize_skill, missing)):
+        for position in SKILL_INDEX.get(skill, ()):
+            covered[position] = covered.get(position, 0) + 1
+    ranked = sorted(covered, key=lambda position: (-covered[position], COURSES[position]['field'] != field, position))
+    if len(ranked) < count and field is not None:
+        ranked += [position for position, course in enumerate(COURSES)
+                   if course['field'] == field and position not in covered]
+    return [(COURSES[position]['name'], COURSES[position]['url']) for position in ranked[:count]]
+
+# --- Videos ---
 
 resume_videos = ['https://youtu.be/y8YH0Qbu5h4','https://youtu.be/J-4Fv8nq1iA',
                  'https://youtu.be/yp693O87GmM','https://youtu.be/UeMmCex9uTU',
@@ -0,0 +1,431 @@
+import ast
+import atexit
+import contextlib
+import datetime
+import logging
+import queue
+import sqlite3
+import threading
+from Extraction import create_cache_table
+import Archive
+import Dedup
+import Matching
+import Rollups
+from Metrics import traced
+
+DB_PATH = 'resume_data.db'
+# Idle connections kept open by the pool
+POOL_SIZE = 8
+# Maximum rows the background writer commits in one transaction
+WRITE_BATCH_SIZE = 500
+# Seconds the process waits at exit for queued rows to be written
+EXIT_FLUSH_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+INSERT_SQL = "INSERT INTO user_data (name, email, resume_score, timestamp, page_no, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses, content_hash, blob_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# --- Schema Migrations ---
+# Each migration runs once, in order; PRAGMA user_version records how many have been applied.
+
+def _create_user_data(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            email TEXT,
+            resume_score REAL,
+            timestamp DATETIME,
+            page_no INTEGER,
+            predicted_field TEXT,
+            user_level TEXT,
+            actual_skills TEXT,
+            recommended_skills TEXT,
+            recommended_courses TEXT
+        )
+    ''')
+    create_cache_table(conn)
+
+def _add_cache_fields_version(conn):
+    conn.execute('ALTER TABLE extraction_cache ADD COLUMN fields_version INTEGER DEFAULT 0')
+
+def _add_user_data_content_hash(conn):
+    # Links a row to its cached text so it can be re-scored without the original PDF
+    conn.execute('ALTER TABLE user_data ADD COLUMN content_hash TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_user_data_content_hash ON user_data (content_hash)')
+
+def _add_dashboard_indexes(conn):
+    # Let the Admin aggregates and keyset pages run off indexes instead of scanning user_data
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_user_data_predicted_field ON user_data (predicted_field)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_user_data_user_level ON user_data (user_level)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_user_data_resume_score ON user_data (resume_score)')
+
+def _create_skill_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS skill (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS candidate_skill (
+            user_id INTEGER NOT NULL REFERENCES user_data (id) ON DELETE CASCADE,
+            skill_id INTEGER NOT NULL REFERENCES skill (id),
+            kind TEXT NOT NULL,
+            PRIMARY KEY (user_id, skill_id, kind)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_candidate_skill_skill ON candidate_skill (skill_id, kind, user_id)')
+    # Backfill from the str(list) columns of existing rows
+    for user_id, actual_skills, recommended_skills in conn.execute(
+            "SELECT id, actual_skills, recommended_skills FROM user_data").fetchall():
+        link_skills(conn, user_id, parse_skill_list(actual_skills), 'actual')
+        link_skills(conn, user_id, parse_skill_list(recommended_skills), 'recommended')
+
+def _create_resume_fts(conn):
+    # rowid is the user_data id; text is indexed with Porter stemming for BM25 search
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5 (name, resume_text, tokenize = 'porter unicode61')")
+    conn.execute('''
+        INSERT INTO resume_fts (rowid, name, resume_text)
+        SELECT u.id, u.name, c.text FROM user_data u JOIN extraction_cache c ON c.content_hash = u.content_hash
+    ''')
+
+def _create_dedup_tables(conn):
+    # MinHash signatures and LSH buckets; `python Dedup.py --rebuild` indexes existing resumes
+    Dedup.create_tables(conn)
+
+def _create_rollup_tables(conn):
+    Rollups.create_tables(conn)
+    Rollups.rebuild(conn)
+
+def _add_user_data_blob_id(conn):
+    # The uploaded PDF in the blob store (Blobs.py); NULL for rows stored before it or without the file
+    conn.execute('ALTER TABLE user_data ADD COLUMN blob_id TEXT')
+
+def _create_archive_table(conn):
+    # Parquet files holding rows moved out of user_data by `python Archive.py`
+    Archive.create_tables(conn)
+
+def _create_resume_text(conn):
+    # Extracted text per content hash, kept as long as user_data rows use it (extraction_cache evicts);
+    # the search, matching and dedup rebuilds and re-scoring read it from here
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS resume_text (
+            content_hash TEXT PRIMARY KEY,
+            text TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO resume_text (content_hash, text)
+        SELECT c.content_hash, c.text FROM extraction_cache c
+        WHERE c.content_hash IN (SELECT content_hash FROM user_data)
+    ''')
+    # Rows whose cache entry is already gone may still have their text in the search index
+    conn.execute('''
+        INSERT OR IGNORE INTO resume_text (content_hash, text)
+        SELECT u.content_hash, f.resume_text FROM resume_fts f JOIN user_data u ON u.id = f.rowid
+        WHERE u.content_hash IS NOT NULL AND f.resume_text IS NOT NULL
+    ''')
+
+def _external_resume_fts(conn):
+    # The index keeps only its tokens and reads text for snippets from resume_text through this view,
+    # instead of holding a third copy of every resume; rowid stays the user_data id
+    conn.execute('''
+        CREATE VIEW IF NOT EXISTS resume_doc AS
+        SELECT u.id, u.name, t.text AS resume_text FROM user_data u JOIN resume_text t ON t.content_hash = u.content_hash
+    ''')
+    conn.execute('DROP TABLE IF EXISTS resume_fts')
+    conn.execute('''
+        CREATE VIRTUAL TABLE resume_fts USING fts5 (name, resume_text, content = 'resume_doc', content_rowid = 'id',
+                                                    tokenize = 'porter unicode61')
+    ''')
+    conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('rebuild')")
+
+MIGRATIONS = [_create_user_data, _add_cache_fields_version, _add_user_data_content_hash, _add_dashboard_indexes,
+              _create_skill_tables, _create_resume_fts, _create_dedup_tables, _create_rollup_tables,
+              _add_user_data_blob_id, _create_archive_table, _create_resume_text, _external_resume_fts]
+
+def migrate(conn):
+    """Applies any schema migrations the database hasn't seen yet."""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        with conn:
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+def init_db(db_path=DB_PATH):
+    """Migrates the database schema once per process."""
+    with _init_lock:
+        if db_path in _initialized:
+            return
+        conn = create_connection(db_path)
+        try:
+            migrate(conn)
+        finally:
+            conn.close()
+        _initialized.add(db_path)
+
+# --- Connections ---
+
+def create_connection(db_path=DB_PATH):
+    """Creates a connection to the SQLite database in WAL mode."""
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, cached_statements=256)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+class ConnectionPool:
+    """Hands out long-lived connections, one borrower at a time per connection."""
+
+    def __init__(self, db_path=DB_PATH, size=POOL_SIZE):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    @contextlib.contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = create_connection(self.db_path)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+pool = ConnectionPool()
+
+def connection():
+    """Borrows a pooled connection: `with connection() as conn: ...`"""
+    return pool.connection()
+
+# --- Writes ---
+
+def make_row(name, email, resume_score, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses, page_no=1, content_hash=None, blob_id=None):
+    """Builds a user_data row tuple in INSERT_SQL column order."""
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return (name, email, resume_score, timestamp, page_no, predicted_field, user_level, str(actual_skills), str(recommended_skills), str(recommended_courses), content_hash, blob_id)
+
+@traced('db.insert_many')
+def insert_many(conn, rows, resume_texts=None, add_vectors=True):
+    """Inserts many make_row() tuples, their skill links, search text and rollup counts in a single transaction.
+
+    resume_texts, if given, holds the extracted text for each row (or None) to keep in resume_text
+    and index for search and job-description matching; rows without a content_hash aren't indexed.
+    Returns [(user_id, text)] of the indexed rows. Their match vectors are appended after the commit,
+    unless add_vectors is False and the caller does it with Matching.add_resumes.
+    """
+    indexed, user_ids = [], []
+    with conn:
+        for row, resume_text in zip(rows, resume_texts or [None] * len(rows)):
+            user_id = conn.execute(INSERT_SQL, row).lastrowid
+            user_ids.append(user_id)
+            link_skills(conn, user_id, parse_skill_list(row[7]), 'actual')
+            link_skills(conn, user_id, parse_skill_list(row[8]), 'recommended')
+            if resume_text and row[10]:
+                conn.execute("INSERT OR IGNORE INTO resume_text (content_hash, text) VALUES (?, ?)", (row[10], resume_text))
+                # resume_fts reads its text back from resume_text (resume_doc), so index what is stored there
+                conn.execute('''
+                    INSERT INTO resume_fts (rowid, name, resume_text) SELECT id, name, resume_text FROM resume_doc WHERE id = ?
+                ''', (user_id,))
+                indexed.append((user_id, resume_text))
+        if user_ids:
+            # SQLite has one writer at a time, so no other rows land between these ids
+            Rollups.add_rows(conn, min(user_ids), max(user_ids))
+    # Vectors are appended once the rows are committed; `python Matching.py --rebuild` restores any lost to a crash
+    if add_vectors:
+        Matching.add_resumes(conn, [user_id for user_id, _ in indexed], [text for _, text in indexed])
+    return indexed
+
+# --- Skills ---
+# Skills are stored once in `skill` and linked to candidates in `candidate_skill`,
+# with kind 'actual' (found in the resume) or 'recommended'.
+
+def parse_skill_list(text):
+    """Parses a str(list) skills column back into a list."""
+    try:
+        skills = ast.literal_eval(text) if text else []
+    except (ValueError, SyntaxError):
+        return []
+    return [skill for skill in skills if isinstance(skill, str) and skill.strip()]
+
+def link_skills(conn, user_id, skills, kind):
+    """Links a user_data row to its skills, creating skill rows as needed."""
+    for skill in skills:
+        conn.execute("INSERT OR IGNORE INTO skill (name) VALUES (?)", (skill.strip(),))
+    conn.executemany(
+        "INSERT OR IGNORE INTO candidate_skill (user_id, skill_id, kind) SELECT ?, id, ? FROM skill WHERE name = ?",
+        [(user_id, kind, skill.strip()) for skill in skills]
+    )
+
+@traced('db.count_candidates_with_skill')
+def count_candidates_with_skill(conn, skill):
+    """Returns how many candidates have a skill in their resume (case-insensitive)."""
+    return conn.execute('''
+        SELECT COUNT(*) FROM candidate_skill cs JOIN skill s ON s.id = cs.skill_id
+        WHERE s.name = ? AND cs.kind = 'actual'
+    ''', (skill.strip(),)).fetchone()[0]
+
+@traced('db.skill_frequency')
+def skill_frequency(conn, kind='actual', field=None, limit=20):
+    """Returns [(skill, candidates)] for the most common skills, optionally within one predicted field."""
+    if field is None:
+        return conn.execute('''
+            SELECT s.name, COUNT(*) AS n FROM candidate_skill cs JOIN skill s ON s.id = cs.skill_id
+            WHERE cs.kind = ? GROUP BY cs.skill_id ORDER BY n DESC LIMIT ?
+        ''', (kind, limit)).fetchall()
+    return conn.execute('''
+        SELECT s.name, COUNT(*) AS n FROM user_data u
+        JOIN candidate_skill cs ON cs.user_id = u.id
+        JOIN skill s ON s.id = cs.skill_id
+        WHERE u.predicted_field = ? AND cs.kind = ? GROUP BY cs.skill_id ORDER BY n DESC LIMIT ?
+    ''', (field, kind, limit)).fetchall()
+
+@traced('db.skill_gap')
+def skill_gap(conn, field=None, limit=20):
+    """Returns [(skill, candidates missing it)] for recommended skills candidates don't list yet."""
+    return conn.execute('''
+        SELECT s.name, COUNT(*) AS n FROM candidate_skill r
+        JOIN skill s ON s.id = r.skill_id
+        JOIN user_data u ON u.id = r.user_id
+        WHERE r.kind = 'recommended' AND (? IS NULL OR u.predicted_field = ?)
+          AND NOT EXISTS (SELECT 1 FROM candidate_skill a
+                          WHERE a.user_id = r.user_id AND a.skill_id = r.skill_id AND a.kind = 'actual')
+        GROUP BY r.skill_id ORDER BY n DESC LIMIT ?
+    ''', (field, field, limit)).fetchall()
+
+class WriteQueue:
+    """Background writer that commits queued user_data rows in batched transactions."""
+
+    def __init__(self, db_path=DB_PATH, batch_size=WRITE_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def put(self, row, resume_text=None):
+        """Queues a row (and its text for the search index) for insertion and returns immediately."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='user_data-writer', daemon=True)
+                self._thread.start()
+        self._queue.put((row, resume_text))
+
+    def flush(self, timeout=None):
+        """Blocks until every queued row has been handled (written, or logged as failed), or timeout seconds;
+        returns whether all were."""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _run(self):
+        conn = None
+        while True:
+            # Block for the first row, then take whatever else is already waiting
+            rows = [self._queue.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Any failure costs this batch only; the thread has to survive to write the rows after it
+            try:
+                if conn is None:
+                    conn = self._connect(len(rows))
+                if conn is not None:
+                    self._write(conn, rows)
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _connect(self, pending):
+        try:
+            init_db(self.db_path)
+            return create_connection(self.db_path)
+        except Exception:
+            # The next batch tries again
+            logger.exception("Could not open %s; dropped %d queued user_data rows", self.db_path, pending)
+            return None
+
+    def _write(self, conn, rows):
+        try:
+            indexed = insert_many(conn, [row for row, _ in rows], [resume_text for _, resume_text in rows], add_vectors=False)
+        except Exception:
+            logger.exception("Failed to write %d user_data rows", len(rows))
+            return
+        try:
+            Matching.add_resumes(conn, [user_id for user_id, _ in indexed], [text for _, text in indexed])
+        except Exception:
+            logger.exception("Wrote %d user_data rows but not their match vectors; "
+                             "`python Matching.py --rebuild` restores them", len(rows))
+
+writer = WriteQueue()
+atexit.register(writer.flush, EXIT_FLUSH_TIMEOUT)
+
+def insert_data(name, email, resume_score, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses, page_no=1, content_hash=None, resume_text=None, blob_id=None):
+    """Queues analysis data for a batched insert into the database."""
+    writer.put(make_row(name, email, resume_score, predicted_field, user_level, actual_skills, recommended_skills, recommended_courses, page_no, content_hash, blob_id), resume_text)
+
+# --- Admin Queries ---
+
+PAGE_COLUMNS = ['id', 'name', 'email', 'resume_score', 'timestamp', 'page_no', 'predicted_field', 'user_level', 'actual_skills', 'recommended_skills', 'recommended_courses']
+
+# Identifies a resume for unique counts: its near-duplicate cluster, else its content, else the row itself
+_RESUME_KEY = "COALESCE(s.cluster_hash, u.content_hash, u.id)"
+
+@traced('db.count_by')
+def count_by(conn, column, unique=False):
+    """Returns [(value, count)] for predicted_field or user_level, largest first.
+
+    Plain counts come from the rollup tables. With unique=True, near-duplicate resubmissions of a
+    resume are counted once; clusters change as resumes arrive, so that count scans user_data.
+    """
+    if column not in ('predicted_field', 'user_level'):
+        raise ValueError(f"Can't group user_data by {column}")
+    if not unique:
+        return Rollups.totals(conn, column)
+    return conn.execute(f'''
+        SELECT u.{column}, COUNT(DISTINCT {_RESUME_KEY}) AS n FROM user_data u
+        LEFT JOIN resume_signature s ON s.content_hash = u.content_hash
+        GROUP BY u.{column} ORDER BY n DESC
+    ''').fetchall()
+
+@traced('db.count_resumes')
+def count_resumes(conn):
+    """Returns (uploads, unique resumes) where near-duplicates count as one resume."""
+    return conn.execute(f'''
+        SELECT COUNT(*), COUNT(DISTINCT {_RESUME_KEY}) FROM user_data u
+        LEFT JOIN resume_signature s ON s.content_hash = u.content_hash
+    ''').fetchone()
+
+@traced('db.score_histogram')
+def score_histogram(conn, bin_width=Rollups.SCORE_BUCKET_WIDTH):
+    """Returns [(bucket start, count)] of resume scores, from the rollups unless bin_width differs."""
+    if bin_width == Rollups.SCORE_BUCKET_WIDTH:
+        return Rollups.totals(conn, 'score_bucket')
+    return conn.execute(
+        "SELECT CAST(resume_score / ? AS INTEGER) * ? AS bucket, COUNT(*) FROM user_data GROUP BY bucket ORDER BY bucket",
+        (bin_width, bin_width)
+    ).fetchall()
+
+def daily_counts(conn, column, days=None):
+    """Returns [(day, value, count)] for predicted_field, user_level or score_bucket from the daily rollups."""
+    if column not in Rollups.DIMENSIONS:
+        raise ValueError(f"No daily rollup for {column}")
+    return Rollups.daily(conn, column, days)
+
+@traced('db.fetch_page')
+def fetch_page(conn, before_id=None, page_size=50):
+    """Returns up to page_size rows, newest first, with id below before_id (keyset pagination)."""
+    columns = ', '.join(PAGE_COLUMNS)
+    if before_id is None:
+        return conn.execute(f"SELECT {columns} FROM user_data ORDER BY id DESC LIMIT ?", (page_size,)).fetchall()
+    return conn.execute(f"SELECT {columns} FROM user_data WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, page_size)).fetchall()
@@ -0,0 +1,176 @@
+"""Near-duplicate resume detection with MinHash signatures and an LSH band index.
+
+Every resume gets a MinHash signature of its word shingles. The signature is split into
+LSH_BANDS bands and each band is hashed to a bucket in the `lsh_band` table. Resumes that share
+any bucket are candidates, and only those are compared, so a lookup never scans every stored
+signature. Resumes whose estimated Jaccard similarity is at least DUPLICATE_THRESHOLD share a
+cluster, the content hash of the first one seen.
+
+Index resumes analysed before this module existed with:
+    python Dedup.py --rebuild
+"""
+import argparse
+import hashlib
+import re
+import time
+import zlib
+import numpy as np
+from Metrics import traced
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 similarity almost always share a bucket
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Fixed seed so signatures stored in the database stay comparable across runs
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r'\w+')
+
+# --- Signatures ---
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Returns the set of lower-cased word n-grams in text."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+@traced('dedup.signature')
+def signature(text):
+    """Returns the MinHash signature of text as a uint32 array, or None for text without words."""
+    hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text)), dtype=np.uint64)
+    if not hashes.size:
+        return None
+    # One universal hash per permutation: (a * x + b) mod p, truncated to 32 bits
+    permuted = (np.outer(hashes, _A) + _B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def similarity(first, second):
+    """Estimates the Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+def band_buckets(sig):
+    """Returns one bucket id per band: a 64-bit hash of that band's slice of the signature."""
+    return [int.from_bytes(hashlib.blake2b(sig[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(), digest_size=8).digest(),
+                           'big', signed=True)
+            for band in range(LSH_BANDS)]
+
+# --- Index ---
+
+def create_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS resume_signature (
+            content_hash TEXT PRIMARY KEY,
+            signature BLOB NOT NULL,
+            cluster_hash TEXT NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resume_signature_cluster ON resume_signature (cluster_hash)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS lsh_band (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, content_hash)
+        ) WITHOUT ROWID
+    ''')
+
+@traced('dedup.lookup')
+def find_near_duplicate(conn, sig, digest=None, threshold=DUPLICATE_THRESHOLD):
+    """Returns (content_hash, cluster_hash, similarity) of the closest indexed resume, or None.
+
+    Only resumes sharing an LSH bucket with sig are compared; digest excludes the resume itself.
+    """
+    if sig is None:
+        return None
+    buckets = band_buckets(sig)
+    candidates = conn.execute(f'''
+        SELECT s.content_hash, s.cluster_hash, s.signature FROM resume_signature s
+        WHERE s.content_hash IN (SELECT content_hash FROM lsh_band
+                                 WHERE {' OR '.join(['(band = ? AND bucket = ?)'] * LSH_BANDS)})
+          AND s.content_hash IS NOT ?
+    ''', [value for band, bucket in enumerate(buckets) for value in (band, bucket)] + [digest]).fetchall()
+    best = None
+    for content_hash, cluster_hash, blob in candidates:
+        score = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+        if score >= threshold and (best is None or score > best[2]):
+            best = (content_hash, cluster_hash, score)
+    return best
+
+def index_resume(conn, digest, sig, match=False, threshold=DUPLICATE_THRESHOLD):
+    """Adds a resume's signature to the index; returns its cluster hash.
+
+    match is a find_near_duplicate() result the caller already has (None for no duplicate);
+    it's looked up when omitted. A resume that is already indexed keeps its cluster.
+    Call inside a transaction.
+    """
+    row = conn.execute("SELECT cluster_hash FROM resume_signature WHERE content_hash = ?", (digest,)).fetchone()
+    if row:
+        return row[0]
+    if sig is None:
+        return digest
+    if match is False:
+        match = find_near_duplicate(conn, sig, digest, threshold)
+    cluster_hash = match[1] if match else digest
+    conn.execute("INSERT INTO resume_signature (content_hash, signature, cluster_hash) VALUES (?, ?, ?)",
+                 (digest, sig.tobytes(), cluster_hash))
+    conn.executemany("INSERT OR IGNORE INTO lsh_band (band, bucket, content_hash) VALUES (?, ?, ?)",
+                     [(band, bucket, digest) for band, bucket in enumerate(band_buckets(sig))])
+    return cluster_hash
+
+def index_resumes(conn, entries, threshold=DUPLICATE_THRESHOLD):
+    """Indexes many (content_hash, signature) pairs in one transaction, in order."""
+    with conn:
+        for digest, sig in entries:
+            index_resume(conn, digest, sig, threshold=threshold)
+
+def remove_unused(conn, digests):
+    """Drops the signatures of the given content hashes that no user_data row has any more.
+
+    Call inside the transaction that deletes the rows.
+    """
+    unused = [(digest,) for digest in digests
+              if not conn.execute("SELECT 1 FROM user_data WHERE content_hash = ? LIMIT 1", (digest,)).fetchone()]
+    conn.executemany("DELETE FROM lsh_band WHERE content_hash = ?", unused)
+    conn.executemany("DELETE FROM resume_signature WHERE content_hash = ?", unused)
+    return len(unused)
+
+def rebuild_index(conn, threshold=DUPLICATE_THRESHOLD):
+    """Re-indexes every analysed resume whose text is stored, oldest upload first; returns resumes indexed.
+
+    Signatures of resumes without stored text are kept, since they couldn't be recomputed.
+    """
+    rows = conn.execute('''
+        SELECT t.content_hash, t.text FROM resume_text t
+        JOIN (SELECT content_hash, MIN(id) AS first_id FROM user_data GROUP BY content_hash) u
+          ON u.content_hash = t.content_hash
+        ORDER BY u.first_id
+    ''').fetchall()
+    with conn:
+        conn.execute("DELETE FROM lsh_band WHERE content_hash IN (SELECT content_hash FROM resume_text)")
+        conn.execute("DELETE FROM resume_signature WHERE content_hash IN (SELECT content_hash FROM resume_text)")
+        for digest, text in rows:
+            index_resume(conn, digest, signature(text), threshold=threshold)
+    return len(rows)
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Rebuild the near-duplicate resume index.")
+    parser.add_argument('--rebuild', action='store_true', help="re-index every resume with stored text")
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        start = time.perf_counter()
+        indexed = rebuild_index(conn)
+        clusters = conn.execute("SELECT COUNT(DISTINCT cluster_hash) FROM resume_signature").fetchone()[0]
+        print(f"Indexed {indexed} resumes into {clusters} clusters in {time.perf_counter() - start:.2f}s")
+    conn.close()
@@ -0,0 +1,75 @@
+"""Streaming export of user_data to CSV or Parquet.
+
+Rows are read from the cursor in chunks, so memory stays flat however large the table is:
+    python Export.py User_Data.csv
+    python Export.py User_Data.parquet --format parquet
+"""
+import argparse
+import csv
+import time
+
+EXPORT_COLUMNS = ['id', 'name', 'email', 'resume_score', 'timestamp', 'page_no', 'predicted_field', 'user_level',
+                  'actual_skills', 'recommended_skills', 'recommended_courses', 'content_hash', 'blob_id']
+CHUNK_SIZE = 5000
+
+def iter_chunks(conn, chunk_size=CHUNK_SIZE):
+    """Yields lists of user_data rows (EXPORT_COLUMNS order) straight from the cursor."""
+    cursor = conn.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM user_data ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+def write_csv(conn, path, chunk_size=CHUNK_SIZE):
+    """Streams user_data to a CSV file; returns the number of rows written."""
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in iter_chunks(conn, chunk_size):
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+def parquet_schema():
+    """Returns the Arrow schema of EXPORT_COLUMNS."""
+    import pyarrow as pa
+    return pa.schema([
+        ('id', pa.int64()), ('name', pa.string()), ('email', pa.string()), ('resume_score', pa.float64()),
+        ('timestamp', pa.string()), ('page_no', pa.int64()), ('predicted_field', pa.string()),
+        ('user_level', pa.string()), ('actual_skills', pa.string()), ('recommended_skills', pa.string()),
+        ('recommended_courses', pa.string()), ('content_hash', pa.string()), ('blob_id', pa.string()),
+    ])
+
+def rows_to_table(rows, schema):
+    """Builds an Arrow table from user_data rows in EXPORT_COLUMNS order."""
+    import pyarrow as pa
+    columns = list(zip(*rows))
+    return pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+
+def write_parquet(conn, path, chunk_size=CHUNK_SIZE):
+    """Streams user_data to a Parquet file one row group per chunk; returns the number of rows written."""
+    import pyarrow.parquet as pq
+    schema = parquet_schema()
+    written = 0
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for rows in iter_chunks(conn, chunk_size):
+            writer.write_table(rows_to_table(rows, schema))
+            written += len(rows)
+    return written
+
+EXPORTERS = {'csv': write_csv, 'parquet': write_parquet}
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection
+    parser = argparse.ArgumentParser(description="Export user_data to CSV or Parquet.")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=sorted(EXPORTERS), default='csv')
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    start = time.perf_counter()
+    written = EXPORTERS[args.format](conn, args.path)
+    conn.close()
+    print(f"Exported {written} rows to {args.path} in {time.perf_counter() - start:.2f}s")
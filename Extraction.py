@@ -0,0 +1,186 @@
+import hashlib
+import io
+import json
+import time
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument, PDFTextExtractionNotAllowed
+from pdfminer.pdftypes import resolve1
+from Metrics import traced
+
+# Upper bound on the total size of cached extractions (text + parsed fields).
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Budgets for untrusted uploads: larger files are rejected, longer documents are truncated.
+MAX_PDF_BYTES = 10 * 1024 * 1024
+MAX_PAGES = 10
+MAX_TEXT_CHARS = 256 * 1024
+
+# --- PDF Text Extraction ---
+
+def _open_document(fh):
+    document = PDFDocument(PDFParser(fh))
+    if not document.is_extractable:
+        raise PDFTextExtractionNotAllowed(f"Text extraction is not allowed: {fh!r}")
+    return document
+
+def _document_page_count(document):
+    try:
+        return int(resolve1(document.catalog['Pages'])['Count'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _iter_document_pages(document, max_pages=0, fast=False, stop=None):
+    resource_manager = PDFResourceManager()
+    page_buffer = io.StringIO()
+    # Without LAParams pdfminer skips layout analysis: much faster, but lines and columns aren't reconstructed
+    converter = TextConverter(resource_manager, page_buffer, laparams=None if fast else LAParams())
+    page_interpreter = PDFPageInterpreter(resource_manager, converter)
+    try:
+        for page_number, page in enumerate(PDFPage.create_pages(document)):
+            if max_pages and page_number >= max_pages:
+                break
+            page_interpreter.process_page(page)
+            page_text = page_buffer.getvalue()
+            yield page_text
+            # Checked after the page is handed out, so the page that satisfies stop is still read
+            if stop is not None and stop(page_text):
+                break
+            page_buffer.seek(0)
+            page_buffer.truncate(0)
+    finally:
+        converter.close()
+        page_buffer.close()
+
+def iter_pages(fh, max_pages=0, fast=False, stop=None):
+    """Yields the text of each page of an open binary PDF stream, parsing one page at a time.
+
+    Parsing ends after max_pages pages (0 means no limit) or once stop(page_text),
+    called with each new page's text, returns True.
+    """
+    yield from _iter_document_pages(_open_document(fh), max_pages, fast, stop)
+
+@traced('pdf.read')
+def read_pdf(fh, max_pages=0, max_chars=0, fast=False, stop=None):
+    """Extracts text and the page count from an open binary PDF stream, one page at a time.
+
+    Reading ends after max_pages pages or max_chars characters (0 means no limit),
+    or once stop(page_text) returns True for the page just read (see iter_pages).
+    The page count is the document's total even when reading ends early.
+    """
+    document = _open_document(fh)
+    pages, size, pages_read = [], 0, 0
+    for page_text in _iter_document_pages(document, max_pages, fast, stop):
+        pages_read += 1
+        if max_chars and size + len(page_text) > max_chars:
+            pages.append(page_text[:max_chars - size])
+            break
+        pages.append(page_text)
+        size += len(page_text)
+    return ''.join(pages), _document_page_count(document) or pages_read
+
+def pdf_reader(file):
+    """Extracts text from a PDF file."""
+    with open(file, 'rb') as fh:
+        text, _ = read_pdf(fh)
+    return text
+
+# --- Extraction Cache ---
+
+def content_hash(pdf_bytes):
+    """Returns the SHA-256 hex digest used as the cache key for a PDF."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+def create_cache_table(conn):
+    """Creates the extraction_cache table if it doesn't exist."""
+    c = conn.cursor()
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS extraction_cache (
+            content_hash TEXT PRIMARY KEY,
+            text TEXT,
+            page_count INTEGER,
+            fields TEXT,
+            size INTEGER,
+            last_access REAL
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache (last_access)')
+    conn.commit()
+
+@traced('db.extraction_cache.get')
+def get_cached_extraction(conn, digest):
+    """Returns the cached extraction for a content hash, or None on a miss."""
+    row = conn.execute(
+        "SELECT text, page_count, fields, fields_version FROM extraction_cache WHERE content_hash = ?", (digest,)
+    ).fetchone()
+    if row is None:
+        return None
+    conn.execute("UPDATE extraction_cache SET last_access = ? WHERE content_hash = ?", (time.time(), digest))
+    conn.commit()
+    text, page_count, fields, fields_version = row
+    return {'hash': digest, 'text': text, 'page_count': page_count, 'fields': json.loads(fields), 'fields_version': fields_version}
+
+@traced('db.extraction_cache.store')
+def store_extraction(conn, digest, text, page_count, fields, fields_version=0, max_bytes=CACHE_MAX_BYTES):
+    """Stores an extraction in the cache and evicts least recently used entries over the size bound."""
+    store_extractions(conn, [(digest, text, page_count, fields, fields_version)], max_bytes)
+
+@traced('db.extraction_cache.store_many')
+def store_extractions(conn, entries, max_bytes=CACHE_MAX_BYTES):
+    """Stores many (digest, text, page_count, fields, fields_version) entries, evicting once at the end."""
+    now = time.time()
+    rows = []
+    for digest, text, page_count, fields, fields_version in entries:
+        fields_json = json.dumps(fields)
+        size = len(text.encode('utf-8')) + len(fields_json.encode('utf-8'))
+        rows.append((digest, text, page_count, fields_json, fields_version, size, now))
+    conn.executemany(
+        "INSERT OR REPLACE INTO extraction_cache (content_hash, text, page_count, fields, fields_version, size, last_access) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    evict_cache(conn, max_bytes)
+    conn.commit()
+
+def store_fields(conn, digest, fields, fields_version):
+    """Replaces the parsed fields of an existing cache entry."""
+    conn.execute(
+        "UPDATE extraction_cache SET fields = ?, fields_version = ? WHERE content_hash = ?",
+        (json.dumps(fields), fields_version, digest)
+    )
+    conn.commit()
+
+def evict_cache(conn, max_bytes=CACHE_MAX_BYTES):
+    """Deletes least recently used cache entries until the total size fits in max_bytes."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extraction_cache").fetchone()[0]
+    if total <= max_bytes:
+        return
+    stale = []
+    for digest, size in conn.execute("SELECT content_hash, size FROM extraction_cache ORDER BY last_access"):
+        if total <= max_bytes:
+            break
+        stale.append((digest,))
+        total -= size
+    conn.executemany("DELETE FROM extraction_cache WHERE content_hash = ?", stale)
+
+def extract_resume(conn, pdf_bytes, parse_fields=None, fields_version=0, max_pages=MAX_PAGES, max_chars=MAX_TEXT_CHARS):
+    """Returns text, page count and parsed fields for a PDF, parsing it only on a cache miss.
+
+    parse_fields is called with the extracted text on a miss and its (JSON
+    serialisable) result is cached alongside the text. Bump fields_version
+    when parse_fields changes so cached entries re-parse their stored text
+    instead of re-reading the PDF.
+    """
+    digest = content_hash(pdf_bytes)
+    cached = get_cached_extraction(conn, digest)
+    if cached is not None and (parse_fields is None or cached['fields_version'] == fields_version):
+        return cached
+    if cached is not None:
+        text, page_count = cached['text'], cached['page_count']
+    else:
+        text, page_count = read_pdf(io.BytesIO(pdf_bytes), max_pages, max_chars)
+    fields = parse_fields(text) if parse_fields else {}
+    store_extraction(conn, digest, text, page_count, fields, fields_version)
+    return {'hash': digest, 'text': text, 'page_count': page_count, 'fields': fields, 'fields_version': fields_version}
@@ -0,0 +1,319 @@
+"""Ranks stored resumes against a job description.
+
+Every resume is embedded once when its row is inserted: a hashed, L2-normalised log-TF vector of
+its words. Vectors are appended to a float16 matrix on disk next to the database and memory-mapped
+for queries, so a top-k match is one chunked matrix-vector product over the file. Document
+frequencies per dimension are kept alongside, and the query is IDF-weighted so words every resume
+shares ("experience", "skills") count for little.
+
+    python Matching.py job_description.txt --top 10
+    python Matching.py --rebuild    # re-embed every resume whose text is stored
+    python Matching.py --prune      # drop vectors of rows no longer in user_data
+"""
+import argparse
+import contextlib
+import functools
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import numpy as np
+from Metrics import traced
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: only the in-process lock applies, so run a single writing process there
+    fcntl = None
+
+DIM = 2048
+# Rows scored per matrix-vector product; bounds the float32 working set to CHUNK_ROWS * DIM * 4 bytes
+CHUNK_ROWS = 65536
+TOKEN_RE = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9]+)*')
+STOPWORDS = frozenset('''a an and are as at be by for from has have in is it its of on or that the this to was were
+                         will with i my me we our you your he she they their'''.split())
+
+# --- Embedding ---
+
+@functools.lru_cache(maxsize=1 << 16)
+def _feature(term):
+    # Stable across processes (unlike hash()), so vectors written by Batch.py match the app's queries
+    digest = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest % DIM, 1.0 if digest >> 63 else -1.0
+
+@traced('match.embed')
+def embed(texts):
+    """Returns an (n_texts, DIM) float32 matrix of L2-normalised hashed log-TF word vectors."""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for term in TOKEN_RE.findall((text or '').lower()):
+            if term in STOPWORDS:
+                continue
+            column, sign = _feature(term)
+            vectors[row, column] += sign
+    vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+# --- Vector Store ---
+
+class VectorStore:
+    """Append-only float16 matrix of resume vectors, a parallel array of user_data ids and
+    per-dimension document frequencies.
+
+    Writers hold an exclusive lock on <directory>.lock, so the app, Batch.py and Server.py
+    processes can append to the same store; readers memory-map whatever complete rows are on disk.
+    """
+
+    def __init__(self, directory, dim=DIM):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, 'vectors.f16')
+        self.ids_path = os.path.join(directory, 'ids.i64')
+        self.df_path = os.path.join(directory, 'df.i64')
+        # Next to the directory, not in it, so it outlives replace_with()
+        self.lock_path = directory + '.lock'
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Holds the store's write lock, across threads and processes; re-entrant within a thread."""
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._depth = 1
+                try:
+                    yield
+                finally:
+                    self._depth = 0
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self):
+        if not os.path.exists(self.ids_path):
+            return 0
+        # Vectors are written before ids, so a row counts once its id is on disk
+        return min(os.path.getsize(self.ids_path) // 8, os.path.getsize(self.vectors_path) // (2 * self.dim))
+
+    def append(self, ids, vectors):
+        """Appends vectors for the given user_data ids."""
+        if not len(ids):
+            return
+        with self.locked():
+            os.makedirs(self.directory, exist_ok=True)
+            # Drop any half-written row left by a writer that died, so ids and vectors stay aligned
+            rows = len(self)
+            for path, row_bytes in ((self.vectors_path, 2 * self.dim), (self.ids_path, 8)):
+                if os.path.exists(path) and os.path.getsize(path) != rows * row_bytes:
+                    os.truncate(path, rows * row_bytes)
+            with open(self.vectors_path, 'ab') as f:
+                f.write(np.asarray(vectors, dtype=np.float16).tobytes())
+            with open(self.ids_path, 'ab') as f:
+                f.write(np.asarray(ids, dtype=np.int64).tobytes())
+            df = self.document_frequencies() + np.count_nonzero(vectors, axis=0)
+            partial = self.df_path + '.partial'
+            df.astype(np.int64).tofile(partial)
+            os.replace(partial, self.df_path)
+
+    def document_frequencies(self):
+        """Returns how many stored vectors are non-zero in each dimension."""
+        if not os.path.exists(self.df_path):
+            return np.zeros(self.dim, dtype=np.int64)
+        return np.fromfile(self.df_path, dtype=np.int64)
+
+    def idf(self):
+        """Returns smoothed inverse document frequencies per dimension."""
+        return (np.log((1 + len(self)) / (1 + self.document_frequencies())) + 1).astype(np.float32)
+
+    def clear(self):
+        with self.locked():
+            for path in (self.vectors_path, self.ids_path, self.df_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def replace_with(self, other):
+        """Swaps another store's directory in for this one's.
+
+        The old directory is moved aside first, so a concurrent reader sees either store or an
+        empty one, never ids from one and vectors from the other.
+        """
+        with self.locked():
+            retired = self.directory + '.old'
+            shutil.rmtree(retired, ignore_errors=True)
+            if os.path.exists(self.directory):
+                os.rename(self.directory, retired)
+            os.makedirs(other.directory, exist_ok=True)
+            os.rename(other.directory, self.directory)
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def load(self):
+        """Returns (ids, vectors) memory-mapped read-only, or empty arrays for an empty store."""
+        rows = len(self)
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, self.dim), dtype=np.float16)
+        ids = np.memmap(self.ids_path, dtype=np.int64, mode='r', shape=(rows,))
+        vectors = np.memmap(self.vectors_path, dtype=np.float16, mode='r', shape=(rows, self.dim))
+        return ids, vectors
+
+    def search(self, query, k=10, chunk_rows=CHUNK_ROWS):
+        """Returns [(user_id, score)] for the k rows scoring highest against a query vector, best first.
+
+        The query is weighted by IDF squared (once for each side of the dot product) and
+        re-normalised, so scores stay in [-1, 1].
+        """
+        ids, vectors = self.load()
+        query = np.asarray(query, dtype=np.float32) * self.idf() ** 2
+        query /= np.linalg.norm(query) or 1
+        best_ids, best_scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        for start in range(0, len(ids), chunk_rows):
+            scores = vectors[start:start + chunk_rows].astype(np.float32) @ query
+            top = np.argpartition(scores, -k)[-k:] if len(scores) > k else np.arange(len(scores))
+            best_ids = np.concatenate([best_ids, ids[start:start + chunk_rows][top]])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_ids, best_scores = best_ids[keep], best_scores[keep]
+        order = np.argsort(best_scores)[::-1]
+        return [(int(best_ids[i]), float(best_scores[i])) for i in order]
+
+@functools.lru_cache(maxsize=None)
+def _store_at(directory):
+    return VectorStore(directory)
+
+def vector_store(conn):
+    """Returns the VectorStore kept next to conn's database file, or None for an in-memory database."""
+    db_file = conn.execute('PRAGMA database_list').fetchone()[2]
+    return _store_at(db_file + '-vectors') if db_file else None
+
+def add_resumes(conn, user_ids, texts):
+    """Embeds resume texts and appends them to the store for conn's database."""
+    store = vector_store(conn)
+    if store is not None and user_ids:
+        store.append(user_ids, embed(texts))
+
+# --- Matching ---
+
+@traced('match.resumes')
+def match_resumes(conn, job_description, k=10):
+    """Ranks stored resumes against a job description.
+
+    Returns [(id, name, email, predicted_field, resume_score, similarity)], best match first.
+    """
+    store = vector_store(conn)
+    if store is None or not job_description.strip():
+        return []
+    # Over-fetch a little so rows deleted from user_data don't shorten the list
+    matches = store.search(embed([job_description])[0], k + 10)
+    rows = {row[0]: row for row in conn.execute(
+        f"SELECT id, name, email, predicted_field, resume_score FROM user_data WHERE id IN ({', '.join('?' * len(matches))})",
+        [user_id for user_id, _ in matches]
+    )} if matches else {}
+    return [rows[user_id] + (similarity,) for user_id, similarity in matches if user_id in rows][:k]
+
+def rebuild_index(conn, batch_size=1000):
+    """Re-embeds every user_data row whose text is stored; returns rows embedded.
+
+    Rows without stored text keep their current vector; vectors of deleted rows are dropped.
+    The new store is built next to the old one and swapped in when complete.
+    """
+    store = vector_store(conn)
+    # Appends from other processes wait for the swap, so none land in the old store and get lost
+    with store.locked():
+        return _rebuild_locked(conn, store, batch_size)
+
+def _rebuild_locked(conn, store, batch_size):
+    old_ids, old_vectors = store.load()
+    old_rows = {int(user_id): row for row, user_id in enumerate(old_ids)}
+    fresh = VectorStore(store.directory + '.rebuild')
+    fresh.clear()
+    embedded, last_id = 0, 0
+    while True:
+        batch = conn.execute('''
+            SELECT u.id, t.text FROM user_data u
+            LEFT JOIN resume_text t ON t.content_hash = u.content_hash
+            WHERE u.id > ? ORDER BY u.id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not batch:
+            break
+        texts = [text for _, text in batch if text is not None]
+        new_vectors = iter(embed(texts))
+        ids, vectors = [], []
+        for user_id, text in batch:
+            if text is not None:
+                ids.append(user_id)
+                vectors.append(next(new_vectors))
+            elif user_id in old_rows:
+                ids.append(user_id)
+                vectors.append(old_vectors[old_rows[user_id]].astype(np.float32))
+        if ids:
+            fresh.append(ids, np.stack(vectors))
+        embedded += len(texts)
+        last_id = batch[-1][0]
+    _swap_in(store, fresh)
+    return embedded
+
+def _swap_in(store, fresh):
+    store.replace_with(fresh)
+    with contextlib.suppress(OSError):
+        os.remove(fresh.lock_path)
+
+def prune(conn, chunk_rows=CHUNK_ROWS):
+    """Drops the vectors of ids no longer in user_data (e.g. archived rows); returns vectors dropped.
+
+    The store is only rewritten when something is dropped, next to the old one like rebuild_index.
+    """
+    store = vector_store(conn)
+    if store is None:
+        return 0
+    with store.locked():
+        ids, vectors = store.load()
+        live = np.fromiter((user_id for user_id, in conn.execute("SELECT id FROM user_data")), dtype=np.int64)
+        keep = np.flatnonzero(np.isin(ids, live))
+        dropped = len(ids) - len(keep)
+        if dropped:
+            fresh = VectorStore(store.directory + '.rebuild')
+            fresh.clear()
+            for start in range(0, len(keep), chunk_rows):
+                rows = keep[start:start + chunk_rows]
+                fresh.append(ids[rows], vectors[rows])
+            _swap_in(store, fresh)
+    return dropped
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Match stored resumes to a job description.")
+    parser.add_argument('job_description', nargs='?', help="text file with the job description")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--rebuild', action='store_true', help="re-embed every resume whose text is stored")
+    parser.add_argument('--prune', action='store_true', help="drop vectors of rows no longer in user_data")
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        start = time.perf_counter()
+        print(f"Embedded {rebuild_index(conn)} resumes in {time.perf_counter() - start:.2f}s")
+    elif args.prune:
+        start = time.perf_counter()
+        print(f"Dropped {prune(conn)} vectors in {time.perf_counter() - start:.2f}s")
+    if args.job_description:
+        with open(args.job_description, encoding='utf-8') as f:
+            job_description = f.read()
+        start = time.perf_counter()
+        results = match_resumes(conn, job_description, args.top)
+        for row_id, name, email, field, score, similarity in results:
+            print(f"{similarity:.3f}\t{row_id}\t{name}\t{email}\t{field}\t{score}")
+        print(f"{len(results)} matches in {(time.perf_counter() - start) * 1000:.1f} ms")
+    conn.close()
@@ -0,0 +1,215 @@
+"""In-process timing spans, latency histograms and slow-request profiles.
+
+Wrap work in `with span('name'):` or decorate a function with `@traced('name')`; every span's
+duration lands in a histogram that can be rendered as Prometheus text (render_prometheus()) or
+summarised for the Admin "Performance" tab (summary()). Histograms are per process.
+
+Environment:
+    SRA_METRICS_PORT=9100     serve /metrics from a background thread (see serve())
+    SRA_PROFILE_SLOWEST=5     keep cProfile dumps of the 5 slowest profiled requests
+    SRA_PROFILE_DIR=profiles  where the dumps go
+"""
+import bisect
+import contextlib
+import cProfile
+import functools
+import heapq
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds; observations above the last bound only count towards +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_NAME = 'sra_span_seconds'
+PROFILE_SLOWEST = int(os.environ.get('SRA_PROFILE_SLOWEST', '0'))
+PROFILE_DIR = os.environ.get('SRA_PROFILE_DIR', 'profiles')
+
+# --- Histograms ---
+
+class Histogram:
+    """Fixed-bucket latency histogram, safe to observe from any thread."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        """Returns (per-bucket counts, count, sum) read consistently."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def quantile(self, q):
+        """Estimates a quantile by interpolating within its bucket (like Prometheus' histogram_quantile)."""
+        counts, count, _ = self.snapshot()
+        if not count:
+            return 0.0
+        rank, seen = q * count, 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+def histogram(name):
+    """Returns the histogram for a span name, creating it on first use."""
+    found = _histograms.get(name)
+    if found is None:
+        with _histograms_lock:
+            found = _histograms.setdefault(name, Histogram())
+    return found
+
+def observe(name, seconds):
+    histogram(name).observe(seconds)
+
+def reset():
+    """Drops every recorded histogram."""
+    with _histograms_lock:
+        _histograms.clear()
+
+# --- Spans ---
+
+@contextlib.contextmanager
+def span(name):
+    """Times the enclosed block into the histogram `name`, whether it succeeds or raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+def traced(name):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# --- Reports ---
+
+def summary():
+    """Returns [(name, calls, mean, p50, p95, p99, total)] in seconds, slowest p95 first."""
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    rows = []
+    for name, hist in items:
+        _, count, total = hist.snapshot()
+        if count:
+            rows.append((name, count, total / count, hist.quantile(0.5), hist.quantile(0.95), hist.quantile(0.99), total))
+    return sorted(rows, key=lambda row: row[4], reverse=True)
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus():
+    """Renders every histogram in the Prometheus text exposition format."""
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    lines = [f'# HELP {METRIC_NAME} Duration of traced spans in seconds.', f'# TYPE {METRIC_NAME} histogram']
+    for name, hist in items:
+        counts, count, total = hist.snapshot()
+        span_label = f'span="{_label(name)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(hist.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{{span_label},le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{{span_label},le="+Inf"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{{span_label}}} {total}')
+        lines.append(f'{METRIC_NAME}_count{{{span_label}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+
+def serve(port=None, host='127.0.0.1'):
+    """Serves /metrics on a daemon thread, once per process; port defaults to $SRA_METRICS_PORT.
+
+    Does nothing when no port is configured. Returns the server, or None.
+    """
+    global _server
+    port = port or int(os.environ.get('SRA_METRICS_PORT', '0'))
+    with _server_lock:
+        if _server is None and port:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
+
+# --- Slow-Request Profiles ---
+# cProfile sees only the thread that entered profile_request() (not the stage worker threads),
+# and only one profiler can run at a time, so overlapping requests go unprofiled.
+
+_profiler_lock = threading.Lock()
+_slowest = []  # min-heap of (seconds, path)
+_slowest_lock = threading.Lock()
+
+@contextlib.contextmanager
+def profile_request(name, keep=None):
+    """Times a request as the span `name` and, when profiling is on, keeps the `keep` slowest profiles.
+
+    Dumps are written to PROFILE_DIR as <name>-<ms>ms-<time>.prof for `python -m pstats` or snakeviz.
+    """
+    keep = PROFILE_SLOWEST if keep is None else keep
+    profiler = cProfile.Profile() if keep and _profiler_lock.acquire(blocking=False) else None
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        observe(name, seconds)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            _keep_profile(profiler, name, seconds, keep)
+
+def _keep_profile(profiler, name, seconds, keep):
+    with _slowest_lock:
+        if len(_slowest) >= keep and seconds <= _slowest[0][0]:
+            return
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f'{name}-{seconds * 1000:.0f}ms-{time.time():.0f}.prof')
+        profiler.dump_stats(path)
+        heapq.heappush(_slowest, (seconds, path))
+        while len(_slowest) > keep:
+            _, dropped = heapq.heappop(_slowest)
+            with contextlib.suppress(OSError):
+                os.remove(dropped)
+
+def slowest_profiles():
+    """Returns [(seconds, path)] of the kept profiles, slowest first."""
+    with _slowest_lock:
+        return sorted(_slowest, reverse=True)
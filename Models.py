@@ -0,0 +1,41 @@
+import functools
+import time
+from Metrics import traced
+
+SPACY_MODEL = 'en_core_web_sm'
+# Trainable/rule components shipped with en_core_web_sm; anything not requested is excluded at load time
+SPACY_COMPONENTS = ('tok2vec', 'tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'ner')
+
+# --- Model Registry ---
+# Resources are loaded on first use and cached for the life of the process. Streamlit keeps
+# imported modules across reruns, so a widget click never reloads a model.
+
+def get_nlp(*components):
+    """Returns a cached spaCy pipeline with only the given components (tokenizer only by default).
+
+    The tokenizer alone is spaCy's blank English pipeline, so it works without SPACY_MODEL installed;
+    asking for components raises OSError when the model is missing.
+    """
+    return _load_nlp(tuple(sorted(components)))
+
+@functools.lru_cache(maxsize=None)
+@traced('model.spacy_load')
+def _load_nlp(components):
+    import spacy
+    if not components:
+        # Same English tokenizer rules as the model, minus the download
+        return spacy.blank('en')
+    exclude = [name for name in SPACY_COMPONENTS if name not in components]
+    nlp = spacy.load(SPACY_MODEL, exclude=exclude)
+    return nlp
+
+if __name__ == '__main__':
+    # Measures cold-start against cached (per-rerun) lookup cost
+    for label, loader in [('spacy tokenizer', get_nlp), ('spacy ner', lambda: get_nlp('ner'))]:
+        start = time.perf_counter()
+        loader()
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        loader()
+        warm = time.perf_counter() - start
+        print(f"{label}: cold {cold * 1000:.1f} ms, cached {warm * 1000000:.1f} us")
@@ -0,0 +1,79 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from Analysis import FIELDS, candidate_level, recommend_courses
+from Classifier import classify, rank_fields
+from Contacts import extract_contacts
+from Metrics import span, traced
+from Scoring import score
+from Skills import scan
+from VideoCache import get_video_info
+
+STAGE_WORKERS = 4
+# basic_info keys stored with the cached parsed fields, so repeat uploads skip the NER pass
+CONTACT_FIELDS = ('name', 'email', 'phone')
+
+_executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix='analysis-stage')
+
+# --- Stages ---
+# Stages are plain functions of the extracted text so they can run on worker threads;
+# only the Streamlit script thread renders their results.
+
+@traced('stage.basic_info')
+def basic_info(resume_text, page_count, fields=None):
+    """Cheap fields shown first: name, email, phone, page count and candidate level.
+
+    Contacts already in `fields` (this resume's cached parsed fields) are reused instead of extracted again.
+    """
+    if fields and 'contacts' in fields:
+        contacts = dict(fields['contacts'], page_count=page_count)
+    else:
+        contacts = extract_contacts(resume_text, page_count)
+    contacts['user_level'] = candidate_level(page_count)
+    return contacts
+
+def skills_stage(resume_text):
+    """Skill matching, field classification and courses for the candidate's skill gap in the predicted field."""
+    skills, _ = scan(resume_text)
+    probabilities, matched = classify([resume_text])
+    field_scores = rank_fields(probabilities[0])
+    field = field_scores[0][0] if matched[0] else ''
+    return {
+        'skills': skills,
+        'predicted_field': field,
+        'field_scores': field_scores,
+        'recommended_skills': FIELDS[field]['recommended_skills'] if field else [],
+        'courses': recommend_courses(field, skills),
+    }
+
+def with_contacts(fields, basic):
+    """Returns parsed fields with the resume's own contacts added, ready for the extraction cache."""
+    return dict(fields, contacts={key: basic[key] for key in CONTACT_FIELDS})
+
+def score_stage(resume_text):
+    """Section-based resume score with a per-rule breakdown."""
+    return score(resume_text)
+
+def videos_stage(video_urls):
+    """Cached titles and thumbnails for the recommended videos."""
+    return [(video_url,) + get_video_info(video_url) for video_url in video_urls]
+
+# --- Scheduling ---
+
+def _timed(name, fn, args):
+    with span(f'stage.{name}'):
+        return fn(*args)
+
+def submit(name, fn, *args):
+    """Starts a stage on the background pool and returns its Future."""
+    return _executor.submit(_timed, name, fn, args)
+
+def completed(value):
+    """Wraps an already known result (e.g. from the extraction cache) as a finished Future."""
+    future = Future()
+    future.set_result(value)
+    return future
+
+def stream(futures):
+    """Yields (stage name, result) from a {name: Future} dict as each stage finishes."""
+    names = {future: name for name, future in futures.items()}
+    for future in as_completed(names):
+        yield names[future], future.result()
@@ -0,0 +1,88 @@
+"""Page thumbnails for uploaded resumes, rendered once per content hash and cached on disk.
+
+Pages are rasterised with pdfium only when first asked for, so showing an upload costs one
+page render; later pages render as the reader pages through. Images live under
+PREVIEW_DIR/<content hash>/<page>.png and are shown with st.image, which serves them by URL
+instead of inlining the PDF into the page. When the cache outgrows PREVIEW_MAX_BYTES, the
+least recently viewed resumes' images are deleted.
+"""
+import contextlib
+import os
+import shutil
+import threading
+import zlib
+from Metrics import traced
+
+PREVIEW_DIR = 'preview_cache'
+PREVIEW_MAX_BYTES = 64 * 1024 * 1024
+# Thumbnail width in pixels; a text page comes out around 150 KB as PNG
+PREVIEW_WIDTH = 600
+
+# Renders are serialised per page through a fixed set of locks, picked by hash of the image path,
+# so memory stays flat however many resumes are viewed; unrelated pages rarely share a lock
+LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+def _lock_for(key):
+    return _locks[zlib.crc32(key.encode('utf-8')) % LOCK_STRIPES]
+
+def preview_path(content_hash, page_number, cache_dir=PREVIEW_DIR):
+    """Returns where the image for a page (0-based) of a resume is cached."""
+    return os.path.join(cache_dir, content_hash, f'{page_number}.png')
+
+# --- Rendering ---
+
+@traced('preview.render')
+def render_page(pdf_bytes, page_number, width=PREVIEW_WIDTH):
+    """Rasterises one page (0-based) of a PDF to a PIL image `width` pixels wide."""
+    import pypdfium2 as pdfium
+    document = pdfium.PdfDocument(pdf_bytes)
+    try:
+        page = document[page_number]
+        try:
+            bitmap = page.render(scale=width / page.get_width())
+            return bitmap.to_pil()
+        finally:
+            page.close()
+    finally:
+        document.close()
+
+def page_image(pdf_bytes, content_hash, page_number, cache_dir=PREVIEW_DIR, max_bytes=PREVIEW_MAX_BYTES):
+    """Returns the path of a page's cached image, rendering it on first request.
+
+    Concurrent sessions asking for the same page wait for one render instead of repeating it.
+    """
+    path = preview_path(content_hash, page_number, cache_dir)
+    with _lock_for(path):
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image = render_page(pdf_bytes, page_number)
+            partial = f'{path}.{threading.get_ident()}.tmp'
+            image.save(partial, 'PNG', optimize=True)
+            os.replace(partial, path)
+            evict(cache_dir, max_bytes, keep=content_hash)
+    # The directory's mtime marks when the resume was last viewed
+    with contextlib.suppress(OSError):
+        os.utime(os.path.dirname(path))
+    return path
+
+# --- Eviction ---
+
+def evict(cache_dir=PREVIEW_DIR, max_bytes=PREVIEW_MAX_BYTES, keep=None):
+    """Deletes the least recently viewed resumes' images until the cache fits in max_bytes."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_dir() and entry.name != keep:
+                entries.append((entry.stat().st_mtime, _dir_size(entry.path), entry.path))
+    total = sum(size for _, size, _ in entries) + (_dir_size(os.path.join(cache_dir, keep)) if keep else 0)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+def _dir_size(path):
+    if not os.path.isdir(path):
+        return 0
+    return sum(f.stat().st_size for f in os.scandir(path) if f.is_file())
@@ -0,0 +1,111 @@
+"""Precomputed dashboard counts, kept up to date as user_data rows are inserted.
+
+`rollup_total` holds counts per dimension value (predicted field, user level, score bucket) and
+`rollup_daily` the same counts per day. Database.insert_many adds every batch's counts in the
+transaction that inserts it, so the Admin charts read a few rows instead of grouping user_data.
+
+Rows moved out by Archive.py stay counted. Recount from user_data (e.g. after editing rows by
+hand; archived rows then drop out of the counts) with:
+    python Rollups.py --rebuild
+"""
+import argparse
+import datetime
+import time
+from Metrics import traced
+
+SCORE_BUCKET_WIDTH = 10
+# SQL expression giving each row's value per dimension; NULLs become '' (or score 0) as key columns can't be NULL
+DIMENSIONS = {
+    'predicted_field': "COALESCE(predicted_field, '')",
+    'user_level': "COALESCE(user_level, '')",
+    'score_bucket': f"CAST(COALESCE(resume_score, 0) / {SCORE_BUCKET_WIDTH} AS INTEGER) * {SCORE_BUCKET_WIDTH}",
+}
+
+def create_tables(conn):
+    # `value` is untyped so score buckets stay integers and sort numerically
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_total (
+            dimension TEXT NOT NULL,
+            value NOT NULL,
+            n INTEGER NOT NULL,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_daily (
+            dimension TEXT NOT NULL,
+            day TEXT NOT NULL,
+            value NOT NULL,
+            n INTEGER NOT NULL,
+            PRIMARY KEY (dimension, day, value)
+        ) WITHOUT ROWID
+    ''')
+
+# --- Updates ---
+# Neither function commits; callers run them inside their own transaction.
+
+def _accumulate(conn, where='', params=(), sign=1, dimensions=DIMENSIONS):
+    for dimension in dimensions:
+        expression = DIMENSIONS[dimension]
+        conn.execute(f'''
+            INSERT INTO rollup_total (dimension, value, n)
+            SELECT ?, {expression} AS value, {sign} * COUNT(*) FROM user_data {where} GROUP BY value
+            ON CONFLICT (dimension, value) DO UPDATE SET n = n + excluded.n
+        ''', (dimension, *params))
+        conn.execute(f'''
+            INSERT INTO rollup_daily (dimension, day, value, n)
+            SELECT ?, COALESCE(date(timestamp), '') AS day, {expression} AS value, {sign} * COUNT(*) FROM user_data {where}
+            GROUP BY day, value
+            ON CONFLICT (dimension, day, value) DO UPDATE SET n = n + excluded.n
+        ''', (dimension, *params))
+
+def add_rows(conn, first_id, last_id):
+    """Adds the user_data rows with ids first_id..last_id to the rollups."""
+    _accumulate(conn, 'WHERE id BETWEEN ? AND ?', (first_id, last_id))
+
+def adjust_rows(conn, user_ids, sign, dimensions=DIMENSIONS):
+    """Adds (sign=1) or subtracts (sign=-1) the given user_data rows' current values.
+
+    To update rows in place, subtract them, run the UPDATE, then add them back, all in one transaction.
+    """
+    if user_ids:
+        _accumulate(conn, f"WHERE id IN ({', '.join('?' * len(user_ids))})", list(user_ids), int(sign), dimensions)
+
+def rebuild(conn):
+    """Recounts every rollup from user_data."""
+    conn.execute('DELETE FROM rollup_total')
+    conn.execute('DELETE FROM rollup_daily')
+    _accumulate(conn)
+
+# --- Reads ---
+
+@traced('db.rollup_totals')
+def totals(conn, dimension):
+    """Returns [(value, count)] for a dimension; largest first, or by bucket for score_bucket."""
+    order = 'value' if dimension == 'score_bucket' else 'n DESC'
+    return conn.execute(f"SELECT value, n FROM rollup_total WHERE dimension = ? AND n > 0 ORDER BY {order}",
+                        (dimension,)).fetchall()
+
+@traced('db.rollup_daily')
+def daily(conn, dimension, days=None):
+    """Returns [(day, value, count)] for a dimension, oldest day first, optionally only the last `days` days."""
+    since = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat() if days else ''
+    return conn.execute('''
+        SELECT day, value, n FROM rollup_daily WHERE dimension = ? AND day >= ? AND n > 0 ORDER BY day, value
+    ''', (dimension, since)).fetchall()
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard rollup tables.")
+    parser.add_argument('--rebuild', action='store_true', help="recount every rollup from user_data")
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        start = time.perf_counter()
+        with conn:
+            rebuild(conn)
+        rows = conn.execute("SELECT SUM(n) FROM rollup_total WHERE dimension = 'user_level'").fetchone()[0] or 0
+        print(f"Counted {rows} rows in {time.perf_counter() - start:.2f}s")
+    conn.close()
@@ -0,0 +1,134 @@
+"""Section-based resume scoring.
+
+Re-score every stored resume after changing the rules with:
+    python Scoring.py
+"""
+import argparse
+import re
+import time
+import Rollups
+
+# --- Section Detection ---
+# Header spellings per section. A header is a short line that ends with one of them, after an
+# optional bullet and up to three qualifying words ("KEY PROJECTS", "Certifications & Achievements",
+# "• Hobbies:"), and ends there or with ':'. Body text that merely mentions a spelling
+# ("Objective-driven engineer", "worked on projects for clients") doesn't count. pdfminer sometimes
+# runs a header into its neighbours ("...skills.SummaryEdu-Tech"); a title-case spelling wedged
+# between two words counts too.
+
+SECTION_SYNONYMS = {
+    'objective': ['objective', 'career objective', 'career goal', 'professional summary', 'summary', 'about me'],
+    'declaration': ['declaration'],
+    'hobbies': ['hobbies', 'interests', 'extracurricular activities', 'extra-curricular activities'],
+    'achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'honours'],
+    'projects': ['projects', 'personal projects', 'academic projects'],
+}
+
+_SECTION_BY_SYNONYM = {synonym: section for section, synonyms in SECTION_SYNONYMS.items() for synonym in synonyms}
+# Longest spellings first so "career objective" wins over "objective"
+_SYNONYMS = sorted(_SECTION_BY_SYNONYM, key=len, reverse=True)
+_BLANK = r'[^\S\n]'
+SECTION_RE = re.compile(
+    # A header line: bullet, qualifiers, the spelling, then an optional ':' and nothing else
+    rf'^{_BLANK}*(?:[-•*▪●◦·–]+{_BLANK}*)?(?:(?:[^\W\d_]+,?|[&/+]){_BLANK}+){{0,3}}?'
+    rf'(?P<line>{"|".join(re.escape(synonym) for synonym in _SYNONYMS)}){_BLANK}*:?{_BLANK}*$'
+    # Or a glued header: case-sensitive title case, run into the end of one word and the start of the next
+    rf'|(?<=[a-z0-9.,;:)%])(?-i:(?P<glued>{"|".join(re.escape(synonym.title()) for synonym in _SYNONYMS)}))(?=[A-Z])',
+    re.IGNORECASE | re.MULTILINE)
+
+def find_sections(resume_text):
+    """Returns {section: header text as written} for every section header found, in one regex pass."""
+    found = {}
+    for match in SECTION_RE.finditer(resume_text):
+        header = match.group('line') or match.group('glued')
+        found.setdefault(_SECTION_BY_SYNONYM[header.lower()], header)
+    return found
+
+def until_sections(sections=frozenset(SECTION_SYNONYMS)):
+    """Returns a stop hook for Extraction.iter_pages/read_pdf that is true once every given section's header was read."""
+    missing = set(sections)
+    def stop(page_text):
+        missing.difference_update(find_sections(page_text))
+        return not missing
+    return stop
+
+# --- Rules ---
+# A rule awards `points` when check(sections, resume_text) is true. Append to RULES to add one.
+
+def section_rule(section, points, found_tip, missing_tip):
+    """Builds a rule that awards points when a section header is present."""
+    return {
+        'name': section,
+        'points': points,
+        'check': lambda sections, resume_text: section in sections,
+        'found_tip': found_tip,
+        'missing_tip': missing_tip,
+    }
+
+RULES = [
+    section_rule('objective', 20, "Awesome! You have added Objective",
+                 "Please add your career objective, it will give your career intension to the Recruiters."),
+    section_rule('declaration', 20, "Awesome! You have added Declaration✍",
+                 "Please add Declaration✍. It will give the assurance that everything written on your resume is true and fully acknowledged by you"),
+    section_rule('hobbies', 20, "Awesome! You have added your Hobbies⚽",
+                 "Please add Hobbies⚽. It will show your personality to the Recruiters and give the assurance that you are fit for this role or not."),
+    section_rule('achievements', 20, "Awesome! You have added your Achievements🏅",
+                 "Please add Achievements🏅. It will show that you are capable for the required position."),
+    section_rule('projects', 20, "Awesome! You have added your Projects👨‍💻",
+                 "Please add Projects👨‍💻. It will show that you have done work related the required position or not."),
+]
+
+# --- Scoring ---
+
+def score(resume_text, rules=RULES):
+    """Scores extracted text; returns {'resume_score', 'breakdown': [per-rule dicts]}."""
+    sections = find_sections(resume_text)
+    breakdown = []
+    for rule in rules:
+        passed = rule['check'](sections, resume_text)
+        breakdown.append({
+            'rule': rule['name'],
+            'points': rule['points'],
+            'earned': rule['points'] if passed else 0,
+            'tip': rule['found_tip'] if passed else rule['missing_tip'],
+        })
+    return {'resume_score': sum(item['earned'] for item in breakdown), 'breakdown': breakdown}
+
+def rescore_all(conn, rules=RULES, batch_size=1000):
+    """Re-scores every user_data row whose text is stored in resume_text.
+
+    Returns (rows updated, rows skipped because their text was never stored).
+    """
+    updated, last_id = 0, 0
+    while True:
+        batch = conn.execute('''
+            SELECT u.id, t.text FROM user_data u
+            JOIN resume_text t ON t.content_hash = u.content_hash
+            WHERE u.id > ? ORDER BY u.id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not batch:
+            skipped = conn.execute("SELECT COUNT(*) FROM user_data").fetchone()[0] - updated
+            return updated, skipped
+        ids = [row_id for row_id, _ in batch]
+        with conn:
+            # Move each row's count from its old score bucket to its new one
+            Rollups.adjust_rows(conn, ids, -1, ['score_bucket'])
+            conn.executemany("UPDATE user_data SET resume_score = ? WHERE id = ?",
+                             [(score(text, rules)['resume_score'], row_id) for row_id, text in batch])
+            Rollups.adjust_rows(conn, ids, 1, ['score_bucket'])
+        updated += len(batch)
+        last_id = batch[-1][0]
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Re-score stored resumes with the current rules.")
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    start = time.perf_counter()
+    updated, skipped = rescore_all(conn)
+    conn.close()
+    print(f"Re-scored {updated} resumes in {time.perf_counter() - start:.2f}s")
+    if skipped:
+        print(f"Skipped {skipped} rows with no stored text; re-analyse their PDFs to score them.")
@@ -0,0 +1,64 @@
+"""Full-text search over stored resume text (SQLite FTS5, BM25 ranking).
+
+The index holds tokens only; snippets read the text from resume_text through the resume_doc view.
+
+Rebuild the index from the stored text with:
+    python Search.py --rebuild
+PDFs in Uploaded_Resumes/ that were never analysed are indexed by running Batch.py on the folder.
+"""
+import argparse
+import time
+from Metrics import traced
+
+def to_match_query(query):
+    """Turns free-form input into an FTS5 query where every word must match as a literal prefix.
+
+    Prefix matching also finds words pdfminer glued together, e.g. "xcode" in "XCodeTechnologies".
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+@traced('db.search')
+def search(conn, query, limit=20):
+    """Returns [(id, name, email, predicted_field, resume_score, snippet)] best BM25 match first."""
+    match = to_match_query(query)
+    if not match:
+        return []
+    return conn.execute('''
+        SELECT u.id, u.name, u.email, u.predicted_field, u.resume_score,
+               snippet(resume_fts, 1, '**', '**', '…', 12)
+        FROM resume_fts JOIN user_data u ON u.id = resume_fts.rowid
+        WHERE resume_fts MATCH ?
+        ORDER BY bm25(resume_fts)
+        LIMIT ?
+    ''', (match, limit)).fetchall()
+
+def rebuild_index(conn):
+    """Re-indexes every user_data row whose text is stored in resume_text; returns rows indexed.
+
+    resume_fts is an external-content index over resume_doc (user_data joined to resume_text),
+    so it is rebuilt from there and entries of deleted rows go with it.
+    """
+    with conn:
+        conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM resume_doc").fetchone()[0]
+
+if __name__ == '__main__':
+    from Database import DB_PATH, create_connection, migrate
+    parser = argparse.ArgumentParser(description="Search or rebuild the resume full-text index.")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild the index from stored text")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('query', nargs='?', help="search terms")
+    args = parser.parse_args()
+    conn = create_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        start = time.perf_counter()
+        print(f"Indexed {rebuild_index(conn)} resumes in {time.perf_counter() - start:.2f}s")
+    if args.query:
+        start = time.perf_counter()
+        results = search(conn, args.query)
+        for row_id, name, email, field, score, snippet in results:
+            print(f"{row_id}\t{name}\t{email}\t{field}\t{score}\t{snippet}")
+        print(f"{len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+    conn.close()
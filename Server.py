@@ -0,0 +1,241 @@
+"""Headless HTTP API for resume analysis (aiohttp).
+
+    python Server.py --port 8080 --workers 4 --queue-size 64
+
+    POST /analyze       PDF as multipart field `file` or as the raw request body
+                        -> 202 {"job_id", "status", "status_url"}, or 429 when the queue is full
+    POST /score         PDF as above -> 200 {"resume_score", "breakdown"}; parses only the pages needed
+                        to find every scored section, so it answers without queueing a job
+    GET  /jobs/{job_id} -> {"job_id", "status": queued|running|done|failed, "result" | "error"}
+    GET  /health        -> queue depth and worker count
+    GET  /metrics       -> span histograms in Prometheus text format
+
+Analysis runs in a process pool whose workers load spaCy once at start-up. At most
+--queue-size jobs are accepted at a time (queued plus running); beyond that, uploads are
+rejected with 429 and a Retry-After header instead of piling up in memory.
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from aiohttp import web
+from Analysis import analyze_resume, score_pdf
+from Batch import init_worker
+from Blobs import store as blob_store
+from Database import connection, init_db, insert_data
+from Dedup import index_resume, signature
+from Extraction import MAX_PAGES, MAX_PDF_BYTES, MAX_TEXT_CHARS, content_hash, get_cached_extraction, read_pdf, store_extraction
+from Metrics import observe, render_prometheus, span
+
+QUEUE_SIZE = 64
+# Seconds a finished job's result stays available for polling
+JOB_TTL = 3600
+# Seconds between sweeps for expired jobs, so an idle server lets go of old results too
+SWEEP_INTERVAL = 60
+# Seconds clients are told to wait after a 429
+RETRY_AFTER = 5
+
+# --- Worker ---
+# Runs in the pool processes, so it takes and returns plain picklable values.
+
+def analyze_job(pdf_bytes, resume_text=None, page_count=None):
+    """Extracts (unless the text is already known) and analyses one resume."""
+    if resume_text is None:
+        resume_text, page_count = read_pdf(io.BytesIO(pdf_bytes), MAX_PAGES, MAX_TEXT_CHARS)
+    result = analyze_resume(resume_text, page_count)
+    result['page_count'] = page_count
+    return resume_text, page_count, result
+
+def score_job(pdf_bytes):
+    """Scores one resume, parsing its pages only until every scored section has been seen."""
+    return score_pdf(io.BytesIO(pdf_bytes))
+
+# --- Jobs ---
+
+class JobQueue:
+    """Tracks accepted jobs and runs at most `workers` of them at once on the process pool."""
+
+    def __init__(self, workers, queue_size=QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs = {}
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        self._slots = asyncio.Semaphore(workers)
+        self._tasks = set()
+        self._sweeper = None
+
+    async def warm_up(self):
+        """Starts every worker process so the first uploads don't wait for spaCy to load."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+    def start_sweeping(self, interval=SWEEP_INTERVAL):
+        """Drops expired jobs every `interval` seconds until shutdown()."""
+        async def sweep():
+            while True:
+                await asyncio.sleep(interval)
+                self._expire()
+        self._sweeper = asyncio.create_task(sweep())
+
+    async def run(self, fn, *args):
+        """Runs fn on the pool as soon as a worker is free and returns its result."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def get(self, job_id):
+        """Returns a job's state, or None for an unknown or expired job."""
+        self._expire()
+        return self.jobs.get(job_id)
+
+    def active(self):
+        """Number of jobs queued or running."""
+        self._expire()
+        return sum(job['status'] in ('queued', 'running') for job in self.jobs.values())
+
+    def submit(self, pdf_bytes):
+        """Accepts a PDF and returns its job id, or None when the queue is full."""
+        if self.active() >= self.queue_size:
+            return None
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {'status': 'queued', 'submitted': time.time()}
+        task = asyncio.create_task(self._run(job_id, pdf_bytes))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    async def _run(self, job_id, pdf_bytes):
+        job = self.jobs[job_id]
+        loop = asyncio.get_running_loop()
+        digest = content_hash(pdf_bytes)
+        try:
+            cached = await asyncio.to_thread(self._cached, digest)
+            async with self._slots:
+                job['status'] = 'running'
+                observe('job.wait', time.time() - job['submitted'])
+                if cached:
+                    args = (None, cached['text'], cached['page_count'])
+                else:
+                    args = (pdf_bytes,)
+                # Stage spans inside the worker processes stay in those processes; this one covers them all
+                with span('job.analyze'):
+                    resume_text, page_count, result = await loop.run_in_executor(self._pool, analyze_job, *args)
+            await asyncio.to_thread(self._record, pdf_bytes, digest, resume_text, page_count, result, cached is None)
+            job.update(status='done', result=result)
+        except Exception as e:
+            job.update(status='failed', error=str(e))
+        job['finished'] = time.time()
+        observe('job.total', job['finished'] - job['submitted'])
+
+    def _cached(self, digest):
+        with connection() as conn:
+            return get_cached_extraction(conn, digest)
+
+    def _record(self, pdf_bytes, digest, resume_text, page_count, result, store_text):
+        # Uploads through the API show up on the Admin page like the app's
+        blob_id = blob_store.put(pdf_bytes)
+        with connection() as conn:
+            if store_text:
+                store_extraction(conn, digest, resume_text, page_count, {})
+            with conn:
+                index_resume(conn, digest, signature(resume_text))
+        insert_data(result['name'], result['email'], result['resume_score'], result['predicted_field'],
+                    result['user_level'], result['skills'], result['recommended_skills'],
+                    result['recommended_courses'], page_count, digest, resume_text, blob_id)
+
+    def _expire(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.get('finished', cutoff + 1) < cutoff]:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        self._pool.shutdown(cancel_futures=True)
+
+# --- Handlers ---
+
+QUEUE = web.AppKey('queue', JobQueue)
+
+async def _read_pdf(request):
+    if request.content_type.startswith('multipart/'):
+        form = await request.post()
+        upload = form.get('file')
+        if upload is None or not hasattr(upload, 'file'):
+            raise web.HTTPBadRequest(text="Send the PDF as the multipart field 'file'")
+        pdf_bytes = upload.file.read()
+    else:
+        pdf_bytes = await request.read()
+    if not pdf_bytes.startswith(b'%PDF'):
+        raise web.HTTPBadRequest(text="Expected a PDF")
+    return pdf_bytes
+
+async def analyze(request):
+    job_id = request.app[QUEUE].submit(await _read_pdf(request))
+    if job_id is None:
+        raise web.HTTPTooManyRequests(text="Analysis queue is full, retry later", headers={'Retry-After': str(RETRY_AFTER)})
+    status_url = str(request.app.router['job'].url_for(job_id=job_id))
+    return web.json_response({'job_id': job_id, 'status': 'queued', 'status_url': status_url}, status=202,
+                             headers={'Location': status_url})
+
+async def score_resume(request):
+    pdf_bytes = await _read_pdf(request)
+    try:
+        with span('job.score'):
+            result = await request.app[QUEUE].run(score_job, pdf_bytes)
+    except Exception as e:
+        raise web.HTTPUnprocessableEntity(text=f"Could not read the PDF: {e}")
+    return web.json_response(result)
+
+async def job_status(request):
+    job_id = request.match_info['job_id']
+    job = request.app[QUEUE].get(job_id)
+    if job is None:
+        raise web.HTTPNotFound(text="Unknown or expired job")
+    body = {'job_id': job_id, 'status': job['status']}
+    if 'result' in job:
+        body['result'] = job['result']
+    if 'error' in job:
+        body['error'] = job['error']
+    return web.json_response(body)
+
+async def health(request):
+    queue = request.app[QUEUE]
+    return web.json_response({'active_jobs': queue.active(), 'queue_size': queue.queue_size, 'workers': queue.workers})
+
+async def metrics(request):
+    return web.Response(text=render_prometheus(), content_type='text/plain', charset='utf-8')
+
+def create_app(workers=None, queue_size=QUEUE_SIZE):
+    """Builds the aiohttp application; the job queue and worker pool start with it."""
+    # Multipart framing adds a little to the PDF itself
+    app = web.Application(client_max_size=MAX_PDF_BYTES + 64 * 1024)
+    app.router.add_post('/analyze', analyze)
+    app.router.add_post('/score', score_resume)
+    app.router.add_get('/jobs/{job_id}', job_status, name='job')
+    app.router.add_get('/health', health)
+    app.router.add_get('/metrics', metrics)
+
+    async def start(app):
+        init_db()
+        app[QUEUE] = JobQueue(workers or os.cpu_count() or 1, queue_size)
+        await app[QUEUE].warm_up()
+        app[QUEUE].start_sweeping()
+
+    async def stop(app):
+        app[QUEUE].shutdown()
+
+    app.on_startup.append(start)
+    app.on_cleanup.append(stop)
+    return app
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve resume analysis over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="analysis processes (default: CPU count)")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help="jobs accepted at once before answering 429")
+    args = parser.parse_args()
+    web.run_app(create_app(args.workers, args.queue_size), host=args.host, port=args.port)
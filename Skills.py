@@ -0,0 +1,55 @@
+import functools
+from collections import Counter
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
+from Models import get_nlp
+
+# --- Skill Taxonomy ---
+# Keywords are matched case-insensitively on token boundaries; multi-word keywords are fine.
+
+TAXONOMY = {
+    'Data Science': ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit'],
+    'Web Development': ['react', 'django', 'node js', 'node.js', 'react js', 'react.js', 'php', 'laravel', 'magento',
+                        'wordpress', 'javascript', 'angular js', 'angularjs', 'c#', 'flask'],
+    'Android Development': ['android', 'android development', 'flutter', 'kotlin', 'xml', 'kivy'],
+    'IOS Development': ['ios', 'ios development', 'swift', 'cocoa', 'cocoa touch', 'xcode'],
+    'UI-UX Development': ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes',
+                          'storyframes', 'adobe photoshop', 'photoshop', 'editing', 'adobe illustrator',
+                          'illustrator', 'adobe after effects', 'after effects', 'adobe premier pro', 'premier pro',
+                          'adobe indesign', 'indesign', 'wireframe', 'solid', 'grasp', 'user research',
+                          'user experience'],
+}
+
+# --- Matcher ---
+
+@functools.lru_cache(maxsize=None)
+def get_matcher():
+    """Compiles every taxonomy keyword into one PhraseMatcher; returns (nlp, matcher, canonical keyword map)."""
+    nlp = get_nlp()
+    matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+    canonical = {}
+    for field, keywords in TAXONOMY.items():
+        patterns = [nlp.make_doc(keyword) for keyword in keywords]
+        for keyword, pattern in zip(keywords, patterns):
+            canonical[tuple(token.lower_ for token in pattern)] = keyword
+        matcher.add(field, patterns)
+    return nlp, matcher, canonical
+
+def scan(resume_text):
+    """Scans the text once; returns (skills in order of first appearance, Counter of hits per field).
+
+    Overlapping keywords count once, as the longest match ("react js" is not also "react").
+    """
+    nlp, matcher, canonical = get_matcher()
+    # Collapse line breaks so keywords wrapped across lines still match
+    doc = nlp.make_doc(' '.join(resume_text.split()))
+    skills = {}
+    field_hits = Counter()
+    spans = matcher(doc, as_spans=True)
+    # A keyword listed under several fields (e.g. "flask") matches once per field at the same offsets
+    longest = {(span.start, span.end) for span in filter_spans(spans)}
+    for span in spans:
+        if (span.start, span.end) in longest:
+            skills.setdefault(canonical[tuple(token.lower_ for token in span)], span.start)
+            field_hits[span.label_] += 1
+    return sorted(skills, key=skills.get), field_hits
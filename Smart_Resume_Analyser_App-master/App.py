@@ -1,61 +1,71 @@
 import streamlit as st
-import nltk
+import re
 import spacy
-nltk.download('stopwords')
-spacy.load('en_core_web_sm')
 
 import pandas as pd
 import base64, random
 import time, datetime
-from pyresparser import ResumeParser
 from pdfminer3.layout import LAParams, LTTextBox
 from pdfminer3.pdfpage import PDFPage
 from pdfminer3.pdfinterp import PDFResourceManager
 from pdfminer3.pdfinterp import PDFPageInterpreter
 from pdfminer3.converter import TextConverter
 import io, random
+import hashlib
+import os
+import shutil
+import tempfile
 from streamlit_tags import st_tags
 from PIL import Image
 import pymysql
+import sys
+
+# Contact parsing is shared with the main app one directory up; appended so this folder's Courses.py still wins
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Contacts import find_email, find_phone
 from Courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
 import pafy
 import plotly.express as px
 import youtube_dl
 
+@st.cache_data(ttl=7 * 24 * 60 * 60, show_spinner=False)
 def fetch_yt_video(link):
     video = pafy.new(link)
     return video.title
 
 
-def get_table_download_link(df, filename, text):
-    """Generates a link allowing the data in a given panda dataframe to be downloaded
-    in:  dataframe
-    out: href string
-    """
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()  # some strings <-> bytes conversions necessary here
-    # href = f'<a href="data:file/csv;base64,{b64}">Download Report</a>'
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-
 def pdf_reader(file):
     resource_manager = PDFResourceManager()
     fake_file_handle = io.StringIO()
     converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
     page_interpreter = PDFPageInterpreter(resource_manager, converter)
+    page_count = 0
     with open(file, 'rb') as fh:
         for page in PDFPage.get_pages(fh,
                                       caching=True,
                                       check_extractable=True):
             page_interpreter.process_page(page)
-            print(page)
+            page_count += 1
         text = fake_file_handle.getvalue()
 
     # close open handles
     converter.close()
     fake_file_handle.close()
-    return text
+    return text, page_count
+
+
+def save_upload(pdf_file, pdf_hash):
+    # Stored once per content under a two-level shard, so same-named uploads can't overwrite each other
+    shard = os.path.join('./Uploaded_Resumes', pdf_hash[:2], pdf_hash[2:4])
+    path = os.path.join(shard, pdf_hash + '.pdf')
+    if not os.path.exists(path):
+        os.makedirs(shard, exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=shard, suffix='.partial')
+        pdf_file.seek(0)
+        with os.fdopen(fd, 'wb') as f:
+            shutil.copyfileobj(pdf_file, f, 1024 * 1024)
+        os.replace(partial, path)
+    return path
 
 
 def show_pdf(file_path):
@@ -66,12 +76,53 @@ def show_pdf(file_path):
     st.markdown(pdf_display, unsafe_allow_html=True)
 
 
+SKILLS = ['python', 'java', 'c++', 'c#', 'javascript', 'html', 'css', 'sql', 'mysql', 'git', 'flask', 'django',
+          'react', 'node js', 'php', 'laravel', 'magento', 'wordpress', 'angular js', 'tensorflow', 'keras', 'pytorch',
+          'machine learning', 'deep learning', 'streamlit', 'android', 'flutter', 'kotlin', 'xml', 'kivy', 'ios',
+          'swift', 'cocoa', 'cocoa touch', 'xcode', 'figma', 'adobe xd', 'zeplin', 'balsamiq', 'prototyping',
+          'wireframes', 'photoshop', 'illustrator', 'after effects', 'premier pro', 'indesign', 'user research',
+          'user experience', 'ux', 'ui']
+SKILLS_RE = re.compile(r'(?<![\w+#])(' + '|'.join(re.escape(skill) for skill in sorted(SKILLS, key=len, reverse=True))
+                       + r')(?![\w+#])', re.IGNORECASE)
+
+
+@st.cache_resource(show_spinner=False)
+def load_ner():
+    """Loads the spaCy model once per process with only the entity recognizer enabled."""
+    return spacy.load('en_core_web_sm', disable=['tagger', 'parser'])
+
+
+def extract_resume_data(resume_text, page_count):
+    """Pulls name, email, phone, page count and skills out of extracted text (pyresparser's keys)."""
+    # Only the top of the first page goes through NER; pdfminer ends each page with a form feed
+    first_page = resume_text.split('\f', 1)[0][:1000]
+    names = [ent.text.strip() for ent in load_ner()(first_page).ents
+             if ent.label_ == 'PERSON' and len(ent.text.split()) <= 4]
+    skills = {}
+    for match in SKILLS_RE.finditer(resume_text):
+        skills.setdefault(match.group(1).lower(), match.group(1))
+    return {
+        'name': names[0] if names else '',
+        'email': find_email(resume_text),
+        'mobile_number': find_phone(resume_text),
+        'no_of_pages': page_count,
+        'skills': list(skills.values()),
+    }
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def parse_resume(pdf_hash, _file_path):
+    """Parses a resume once per content hash; the single PDF read feeds every extracted field."""
+    resume_text, page_count = pdf_reader(_file_path)
+    return extract_resume_data(resume_text, page_count), resume_text
+
+
 def course_recommender(course_list):
     st.subheader("**Courses & Certificates🎓 Recommendations**")
     c = 0
     rec_course = []
     no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 4)
-    random.shuffle(course_list)
+    # Iterates in catalog order; shuffling here mutated the shared module-level list for every session
     for c_name, c_link in course_list:
         c += 1
         st.markdown(f"({c}) [{c_name}]({c_link})")
@@ -143,15 +194,11 @@ def run():
         if pdf_file is not None:
             # with st.spinner('Uploading your Resume....'):
             #     time.sleep(4)
-            save_image_path = './Uploaded_Resumes/' + pdf_file.name
-            with open(save_image_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
+            pdf_hash = hashlib.sha256(pdf_file.getvalue()).hexdigest()
+            save_image_path = save_upload(pdf_file, pdf_hash)
             show_pdf(save_image_path)
-            resume_data = ResumeParser(save_image_path).get_extracted_data()
+            resume_data, resume_text = parse_resume(pdf_hash, save_image_path)
             if resume_data:
-                ## Get the whole resume data
-                resume_text = pdf_reader(save_image_path)
-
                 st.header("**Resume Analysis**")
                 st.success("Hello " + resume_data['name'])
                 st.subheader("**Your Basic info**")
@@ -316,7 +363,7 @@ def run():
                         '''<h4 style='text-align: left; color: #fabc10;'>[-] According to our recommendation please add Declaration✍. It will give the assurance that everything written on your resume is true and fully acknowledged by you</h4>''',
                         unsafe_allow_html=True)
 
-                if 'Hobbies' or 'Interests' in resume_text:
+                if 'Hobbies' in resume_text or 'Interests' in resume_text:
                     resume_score = resume_score + 20
                     st.markdown(
                         '''<h4 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies⚽</h4>''',
@@ -356,13 +403,8 @@ def run():
                     </style>""",
                     unsafe_allow_html=True,
                 )
-                my_bar = st.progress(0)
-                score = 0
-                for percent_complete in range(resume_score):
-                    score += 1
-                    time.sleep(0.1)
-                    my_bar.progress(percent_complete + 1)
-                st.success('** Your Resume Writing Score: ' + str(score) + '**')
+                st.progress(resume_score)
+                st.success('** Your Resume Writing Score: ' + str(resume_score) + '**')
                 st.warning(
                     "** Note: This score is calculated based on the content that you have added in your Resume. **")
                 st.balloons()
@@ -406,25 +448,21 @@ def run():
                                                  'Predicted Field', 'User Level', 'Actual Skills', 'Recommended Skills',
                                                  'Recommended Course'])
                 st.dataframe(df)
-                st.markdown(get_table_download_link(df, 'User_Data.csv', 'Download Report'), unsafe_allow_html=True)
-                ## Admin Side Data
-                query = 'select * from user_data;'
-                plot_data = pd.read_sql(query, connection)
+                st.download_button('Download Report', df.to_csv(index=False), 'User_Data.csv', 'text/csv')
+                ## Admin Side Data, aggregated in SQL instead of re-reading the whole table
 
                 ## Pie chart for predicted field recommendations
-                labels = plot_data.Predicted_Field.unique()
-                print(labels)
-                values = plot_data.Predicted_Field.value_counts()
-                print(values)
+                cursor.execute('''SELECT Predicted_Field, COUNT(*) FROM user_data GROUP BY Predicted_Field''')
+                field_counts = pd.DataFrame(cursor.fetchall(), columns=['Predicted Field', 'Count'])
                 st.subheader("📈 **Pie-Chart for Predicted Field Recommendations**")
-                fig = px.pie(df, values=values, names=labels, title='Predicted Field according to the Skills')
+                fig = px.pie(field_counts, values='Count', names='Predicted Field', title='Predicted Field according to the Skills')
                 st.plotly_chart(fig)
 
                 ### Pie chart for User's👨‍💻 Experienced Level
-                labels = plot_data.User_level.unique()
-                values = plot_data.User_level.value_counts()
+                cursor.execute('''SELECT User_level, COUNT(*) FROM user_data GROUP BY User_level''')
+                level_counts = pd.DataFrame(cursor.fetchall(), columns=['User Level', 'Count'])
                 st.subheader("📈 ** Pie-Chart for User's👨‍💻 Experienced Level**")
-                fig = px.pie(df, values=values, names=labels, title="Pie-Chart📈 for User's👨‍💻 Experienced Level")
+                fig = px.pie(level_counts, values='Count', names='User Level', title="Pie-Chart📈 for User's👨‍💻 Experienced Level")
                 st.plotly_chart(fig)
 
 
@@ -0,0 +1,97 @@
+"""Local title/thumbnail cache for the YouTube links in Courses.py.
+
+Refresh it ahead of time with:
+    python VideoCache.py [--force]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from Courses import resume_videos, interview_videos
+from Metrics import traced
+
+CACHE_PATH = 'video_cache.json'
+# Entries older than this are still served, but trigger a background refresh
+CACHE_TTL = 7 * 24 * 60 * 60
+REFRESH_WORKERS = 8
+
+_lock = threading.Lock()
+_entries = None
+_refreshing = set()
+_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='video-refresh')
+
+@traced('video.fetch')
+def fetch_video_info(video_url):
+    """Fetches YouTube video title and thumbnail using yt-dlp; returns None if unavailable."""
+    import yt_dlp
+    ydl_opts = {'quiet': True, 'skip_download': True}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        try:
+            info = ydl.extract_info(video_url, download=False)
+        except yt_dlp.utils.DownloadError:
+            return None
+    return {'title': info.get('title', 'N/A'), 'thumbnail': info.get('thumbnail'), 'fetched_at': time.time()}
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_PATH, encoding='utf-8') as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+def _save():
+    tmp_path = CACHE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_entries, f, indent=1)
+    os.replace(tmp_path, CACHE_PATH)
+
+def _refresh_one(video_url):
+    try:
+        info = fetch_video_info(video_url)
+    except Exception:
+        info = None
+    with _lock:
+        _refreshing.discard(video_url)
+        if info is not None:
+            _load()[video_url] = info
+            _save()
+    return info
+
+def refresh(urls, force=False):
+    """Fetches missing or stale entries concurrently and waits for them; returns the number updated."""
+    now = time.time()
+    with _lock:
+        entries = _load()
+        todo = [url for url in urls
+                if force or url not in entries or now - entries[url]['fetched_at'] > CACHE_TTL]
+        _refreshing.update(todo)
+    return sum(1 for info in _executor.map(_refresh_one, todo) if info is not None)
+
+def get_video_info(video_url):
+    """Returns (title, thumbnail) from the local cache without blocking on the network.
+
+    Missing or stale entries are refreshed in the background and picked up on a later render.
+    """
+    with _lock:
+        entry = _load().get(video_url)
+        stale = entry is None or time.time() - entry['fetched_at'] > CACHE_TTL
+        if stale and video_url not in _refreshing:
+            _refreshing.add(video_url)
+            _executor.submit(_refresh_one, video_url)
+    if entry is None:
+        return "Video not available", None
+    return entry['title'], entry['thumbnail']
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Refresh the cached YouTube video metadata.")
+    parser.add_argument('--force', action='store_true', help="refetch entries that are still fresh")
+    args = parser.parse_args()
+    urls = list(dict.fromkeys(resume_videos + interview_videos))
+    start = time.perf_counter()
+    updated = refresh(urls, force=args.force)
+    print(f"Refreshed {updated} of {len(urls)} videos in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,43 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_DIR = os.path.join(ROOT, 'Smart_Resume_Analyser_App-master', 'Uploaded_Resumes')
+
+def _pdf_string(text):
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+def build_pdf(pages):
+    """Returns the bytes of a minimal PDF with one page per string, one text line per line of the string."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        lines = ' '.join(f'{_pdf_string(line)} Tj T*' for line in text.split('\n'))
+        stream = f'BT /F1 12 Tf 14 TL 72 720 Td {lines} ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+    out, offsets = '%PDF-1.4\n', []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n' + ''.join(f'{offset:010d} 00000 n \n' for offset in offsets)
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'
+    return out.encode('latin-1')
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
+
+@pytest.fixture
+def sample_pdf():
+    """Opens one of the bundled sample resumes by file name."""
+    def open_sample(name):
+        return open(os.path.join(SAMPLE_DIR, name), 'rb')
+    return open_sample
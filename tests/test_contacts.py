@@ -0,0 +1,46 @@
+import pytest
+import Contacts
+from Contacts import extract_contacts, find_name, find_phone
+from Extraction import read_pdf
+
+@pytest.fixture(autouse=True)
+def no_ner(monkeypatch):
+    # Exercise the line fallback the same way whether or not the spaCy model is installed
+    monkeypatch.setattr(Contacts, 'get_ner', lambda: None)
+
+@pytest.mark.parametrize('file_name', ['android-developer-1559034496.pdf', 'data-scientist-1559725114.pdf'])
+def test_name_skips_the_job_title_line(sample_pdf, file_name):
+    with sample_pdf(file_name) as fh:
+        text, page_count = read_pdf(fh)
+    contacts = extract_contacts(text, page_count)
+    assert contacts['name'] == 'ROBERT SMITH'
+    assert contacts['email'] == 'info@qwikresume.com'
+
+def test_name_skips_document_headers():
+    assert find_name('Curriculum Vitae\nJane O\'Brien\njane@example.com') == "Jane O'Brien"
+
+@pytest.mark.parametrize('page_text', [
+    'art director & graphic designer\nexperience\nbrokaw  •  art director',
+    'Senior Software Engineer\nResume',
+    'a\nb\nc\nd\ne\nJohn Smith',
+])
+def test_name_is_empty_without_a_name_line(page_text):
+    assert find_name(page_text) == ''
+
+@pytest.mark.parametrize('text, phone', [
+    ('Call +1 (202) 555-0135 anytime', '+1 (202) 555-0135'),
+    ('Mobile: 98765 43210', '98765 43210'),
+    ('Phone: (123) 456 78 99', '(123) 456 78 99'),
+    ('Acme Corp 01.2019 - 12.2023\nPhone: +1-202-555-0135', '+1-202-555-0135'),
+])
+def test_phone_is_found(text, phone):
+    assert find_phone(text) == phone
+
+@pytest.mark.parametrize('text', [
+    'Acme Corp 01.2019 - 12.2023',
+    'Volunteer 2015 2016 2017 2018',
+    'Intern 05/2018 - 06/2020',
+    'Degree 12.05.2019 - 30.06.2021',
+])
+def test_dates_are_not_phones(text):
+    assert find_phone(text) == ''
@@ -0,0 +1,34 @@
+import io
+from Analysis import score_pdf
+from Extraction import iter_pages, read_pdf
+from Scoring import until_sections
+
+SECTIONS_PAGE = 'Objective\nBuild apps.\nDeclaration\nHobbies\nAchievements\nProjects\nA shop app.'
+
+def test_iter_pages_yields_each_page(make_pdf):
+    pages = list(iter_pages(io.BytesIO(make_pdf(['first page', 'second page', 'third page']))))
+    assert [page.split()[:2] for page in pages] == [['first', 'page'], ['second', 'page'], ['third', 'page']]
+
+def test_iter_pages_stops_when_hook_is_true(make_pdf):
+    seen = []
+    def stop(page_text):
+        seen.append(page_text)
+        return 'second' in page_text
+    pages = list(iter_pages(io.BytesIO(make_pdf(['first', 'second', 'third', 'fourth'])), stop=stop))
+    assert len(pages) == 2
+    assert seen == pages
+
+def test_read_pdf_stops_once_every_section_was_seen(make_pdf):
+    pdf = make_pdf([SECTIONS_PAGE, 'Experience\nLots of it.', 'References\nOn request.'])
+    text, page_count = read_pdf(io.BytesIO(pdf), stop=until_sections())
+    assert page_count == 3
+    assert 'Projects' in text and 'Experience' not in text
+
+def test_read_pdf_reads_on_while_sections_are_missing(make_pdf):
+    pdf = make_pdf(['Objective\nBuild apps.', 'Projects\nA shop app.', 'Hobbies\nChess.'])
+    text, _ = read_pdf(io.BytesIO(pdf), stop=until_sections())
+    assert 'Chess' in text
+
+def test_score_pdf_matches_full_score(make_pdf):
+    result = score_pdf(io.BytesIO(make_pdf([SECTIONS_PAGE, 'Experience'])))
+    assert result['resume_score'] == 100
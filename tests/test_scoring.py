@@ -0,0 +1,36 @@
+import pytest
+from Scoring import find_sections, score
+
+@pytest.mark.parametrize('text, section', [
+    ('Projects', 'projects'),
+    ('  Projects:', 'projects'),
+    ('KEY PROJECTS', 'projects'),
+    ('Academic Achievements', 'achievements'),
+    ('Certifications & Achievements', 'achievements'),
+    ('• Hobbies', 'hobbies'),
+    ('- Career Objective:', 'objective'),
+    ('Jane Doe\nSUMMARY\nBackend engineer.', 'objective'),
+])
+def test_header_lines_are_found(text, section):
+    assert section in find_sections(text)
+
+@pytest.mark.parametrize('text', [
+    'Objective-driven engineer with five years of experience.',
+    'Worked on many projects for clients in retail.',
+    'Honors student who loves hobbies like chess',
+    'Led 3 projects',
+])
+def test_body_text_is_not_a_header(text):
+    assert find_sections(text) == {}
+
+def test_header_glued_between_words_is_found():
+    assert find_sections('Passionate about good skills.SummaryEdu-Tech Solutions') == {'objective': 'Summary'}
+
+def test_lower_case_run_on_words_are_not_headers():
+    assert find_sections('cross-functional teams on client projectsand more') == {}
+
+def test_score_counts_each_section_once():
+    text = 'Objective\nProjects\nKEY PROJECTS\nHobbies:\nbuilt projects here'
+    result = score(text)
+    assert result['resume_score'] == 60
+    assert {item['rule'] for item in result['breakdown'] if item['earned']} == {'objective', 'projects', 'hobbies'}
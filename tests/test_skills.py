@@ -0,0 +1,11 @@
+from Skills import scan
+
+def test_scan_works_without_the_spacy_model():
+    # Only the tokenizer is needed, so this runs whether or not en_core_web_sm is installed
+    skills, field_hits = scan('Built apps with React JS, Flask and\nAdobe After Effects.')
+    assert skills == ['react js', 'flask', 'adobe after effects']
+    assert field_hits['Web Development'] == 2
+
+def test_overlapping_keywords_count_once_as_the_longest():
+    skills, _ = scan('iOS development in Swift; react and react.js')
+    assert skills == ['ios development', 'swift', 'react', 'react.js']